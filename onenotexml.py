@@ -23,11 +23,52 @@ Requirements:
     - Python 3.8+
 """
 
+import os
 import sys
+import time
+import queue
+import atexit
+import asyncio
+import collections
+import threading
+import shutil
 import argparse
+import hashlib
+import functools
+import errno
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
 import logging
+import logging.handlers
+
+from src.pipeline_base import EXPORT_ABORTED_MARKER, EXPORT_DONE_MARKER
+
+# orjson is optional; it only speeds up parsing of subprocess progress events
+try:
+    import orjson as progress_json
+except ImportError:
+    import json as progress_json
+
+# Errors expected from OneNote COM calls (ImportError without pywin32)
+try:
+    from pywintypes import com_error
+    _COM_ERRORS = (ImportError, com_error)
+except ImportError:
+    _COM_ERRORS = (ImportError,)
+
+# Prefer PowerShell 7 (pwsh), which starts noticeably faster than Windows
+# PowerShell 5.1; both run the scripts the same way through COM
+PS_EXE = shutil.which("pwsh") or shutil.which("powershell") or "PowerShell"
+
+# Worker count passed to the PowerShell scripts as -Parallelism
+PS_PARALLELISM = str(os.cpu_count() or 4)
+
+# Script locations, resolved once at import
+_PKG_ROOT = Path(__file__).resolve().parent
+_PS_EXPORT = _PKG_ROOT / "scripts" / "export_xml_notebook.ps1"
+_PS_IMAGES = _PKG_ROOT / "scripts" / "extract_images_robust.ps1"
 
 def check_platform():
     """Verify Windows platform."""
@@ -44,12 +85,39 @@ def check_python_version():
         return False
     return True
 
+@functools.lru_cache(maxsize=1)
+def _get_onenote():
+    """Connect to OneNote over COM once and reuse the connection.
+
+    The object belongs to the COM apartment of the thread that created it,
+    so only call this from the main thread.
+
+    Returns:
+        OneNote.Application dispatch object
+
+    Raises:
+        ImportError: If pywin32 is not installed
+        Exception: If the OneNote COM server can't be started
+    """
+    import win32com.client
+    import win32com.client.gencache
+
+    # COM must be initialized on any thread other than the main one
+    if threading.current_thread() is not threading.main_thread():
+        import pythoncom
+        pythoncom.CoInitialize()
+
+    # Early-bound dispatch via the cached typelib wrapper; a stale or
+    # broken gen_py cache falls back to late binding
+    try:
+        return win32com.client.gencache.EnsureDispatch("OneNote.Application")
+    except AttributeError:
+        return win32com.client.Dispatch("OneNote.Application")
+
 def check_onenote():
     """Verify OneNote is accessible via COM."""
     try:
-        import win32com.client
-        onenote = win32com.client.Dispatch("OneNote.Application")
-        del onenote
+        _get_onenote()
         print("OK: OneNote COM API accessible")
         return True
     except ImportError:
@@ -84,7 +152,24 @@ def check_requirements():
 
     return all_passed
 
-def run_subprocess_with_progress(cmd, timeout=300, show_progress=True, debug=False, logger=None):
+def render_progress(event: dict) -> str:
+    """Format a JSON progress event emitted by the PowerShell scripts.
+
+    Args:
+        event: Parsed event, e.g. {"phase": "page", "done": 3, "total": 12, "name": "..."}
+
+    Returns:
+        Human-readable progress line
+    """
+    text = f"{event.get('phase', '').title()} {event.get('done')}/{event.get('total')}"
+    if event.get('name'):
+        text += f": {event['name']}"
+    if event.get('section'):
+        text += f" ({event['section']} > {event.get('page', '')})"
+    return text
+
+def run_subprocess_with_progress(cmd, timeout=300, show_progress=True, debug=False, logger=None,
+                                 capture_stdout=True, cancel=None):
     """Run subprocess and stream output in real-time.
 
     Args:
@@ -93,76 +178,517 @@ def run_subprocess_with_progress(cmd, timeout=300, show_progress=True, debug=Fal
         show_progress: If True, print output as it arrives
         debug: If True, log exceptions and detailed output
         logger: Logger instance for debug output
+        capture_stdout: If False, stdout is only shown/logged, not kept
+            (the returned stdout is then empty)
+        cancel: Optional threading.Event; once set, the process is killed
+            and its (killed) return code is returned
 
     Returns:
-        tuple: (returncode, stdout, stderr)
+        tuple: (returncode, stdout, stderr) - only the last 200 stdout and
+        50 stderr lines are kept; the rest is still shown/logged as it arrives
+
+    Raises:
+        subprocess.TimeoutExpired: If the process runs longer than timeout
     """
-    import threading
-
-    # Start process
-    process = subprocess.Popen(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        encoding='utf-8',
-        errors='replace'
+    return asyncio.run(
+        _stream_subprocess(cmd, timeout, show_progress, debug, logger, capture_stdout, cancel)
     )
 
-    # Queues to collect output from threads
-    stdout_lines = []
-    stderr_lines = []
+async def _stream_subprocess(cmd, timeout, show_progress, debug, logger, capture_stdout=True,
+                             cancel=None):
+    """Event-loop implementation of run_subprocess_with_progress.
 
-    def read_stream(stream, output_list, prefix=""):
-        """Read stream line by line and collect."""
+    Both pipes are drained by coroutines on one event loop, so no
+    reader threads are needed.
+    """
+    # Start process (1 MiB stream buffer so bursts of PowerShell output
+    # don't pause the pipe while lines are being handled)
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=1 << 20
+    )
+
+    # Keep only the tail of each stream so memory stays bounded on long,
+    # chatty runs (callers only look at the first few stderr lines)
+    stdout_lines = collections.deque(maxlen=200 if capture_stdout else 0)
+    stderr_lines = collections.deque(maxlen=50)
+
+    # Bound once, so non-debug runs never build a log record per line
+    debug_log = logger.debug if debug and logger else None
+
+    def handle_lines(raw_lines, output_list, prefix):
+        """Decode output lines, then collect, log and echo them.
+
+        Lines from one read are echoed with a single stdout write.
+        """
+        shown = []
+        for raw_line in raw_lines:
+            line = raw_line.decode('utf-8', errors='replace').rstrip()
+            if line.startswith('{'):
+                # Structured progress event from the PowerShell scripts
+                try:
+                    event = progress_json.loads(line)
+                except ValueError:
+                    event = None
+                if isinstance(event, dict):
+                    line = render_progress(event)
+            if line:  # Skip empty lines
+                output_list.append(line)
+                shown.append(line)
+                if debug_log is not None:
+                    debug_log("%s%s", prefix, line)
+
+        if show_progress and shown:
+            # Indent subprocess output for clarity
+            sys.stdout.write("      " + "\n      ".join(shown) + "\n")
+
+    async def read_stream(stream, output_list, prefix=""):
+        """Read stream in 64 KiB chunks and split it into lines."""
+        last_flush = time.monotonic()
         try:
-            for line in stream:
-                line = line.rstrip()
-                if line:  # Skip empty lines
-                    output_list.append(line)
-                    if show_progress:
-                        # Indent subprocess output for clarity
-                        print(f"      {line}")
-                    if debug and logger:
-                        logger.debug(f"{prefix}{line}")
+            pending = b''
+            while True:
+                chunk = await stream.read(1 << 16)
+                if not chunk:
+                    break
+                # Splitting bytes on newline is safe for UTF-8, so decode
+                # each complete line and carry the partial one over
+                *lines, pending = (pending + chunk).split(b'\n')
+                handle_lines(lines, output_list, prefix)
+
+                # Flush at most every 100ms rather than per line
+                if show_progress and time.monotonic() - last_flush >= 0.1:
+                    sys.stdout.flush()
+                    last_flush = time.monotonic()
+            if pending:
+                handle_lines([pending], output_list, prefix)
+            if show_progress:
+                sys.stdout.flush()
         except Exception as e:
             # In debug mode, log exceptions instead of silently passing
             if debug and logger:
                 logger.error(f"Exception reading subprocess stream: {e}")
                 import traceback
                 logger.error(traceback.format_exc())
-            # Always pass to avoid breaking the thread, but now we've logged it
+            # Always pass to avoid breaking the reader, but now we've logged it
 
-    # Start reader threads
-    stdout_thread = threading.Thread(
-        target=read_stream,
-        args=(process.stdout, stdout_lines)
-    )
-    stderr_thread = threading.Thread(
-        target=read_stream,
-        args=(process.stderr, stderr_lines)
-    )
+    readers = [
+        asyncio.ensure_future(read_stream(process.stdout, stdout_lines)),
+        asyncio.ensure_future(read_stream(process.stderr, stderr_lines)),
+    ]
+
+    # Poll for exit instead of blocking on it, so the loop wakes up every
+    # 100ms and Ctrl+C is handled promptly (notably on Windows)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while process.returncode is None:
+        if loop.time() > deadline:
+            process.kill()
+            await process.wait()
+            for reader in readers:
+                reader.cancel()
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        if cancel is not None and cancel.is_set():
+            process.kill()
+            await process.wait()
+            break
+        await asyncio.sleep(0.1)
+    returncode = process.returncode
+
+    # Give readers a moment to drain what is left in the pipes
+    _, pending = await asyncio.wait(readers, timeout=1)
+    for reader in pending:
+        reader.cancel()
+
+    return returncode, '\n'.join(stdout_lines), '\n'.join(stderr_lines)
 
-    stdout_thread.daemon = True
-    stderr_thread.daemon = True
-    stdout_thread.start()
-    stderr_thread.start()
+def copy_image(img: os.DirEntry, attachments_dir: str, use_hardlink: bool = False):
+    """Copy a single staged image into the vault attachments folder.
 
-    # Wait for process with timeout
+    Args:
+        img: Staged image file (directory entry from os.scandir)
+        attachments_dir: Vault attachments directory
+        use_hardlink: If True, hard link instead of copying when the
+            filesystem allows it (staging and vault share a volume)
+
+    Raises:
+        OSError: If the copy fails
+    """
+    dest_path = os.path.join(attachments_dir, img.name)
+    if use_hardlink:
+        try:
+            try:
+                os.link(img, dest_path)
+            except FileExistsError:
+                # Replace a stale attachment from an earlier run, as a copy would
+                os.unlink(dest_path)
+                os.link(img, dest_path)
+        except OSError:
+            # Cross-device, existing target or no hard link support
+            shutil.copyfile(img, dest_path)
+    else:
+        # Attachment timestamps don't matter to the vault, so skip copy2's
+        # metadata syscalls; copyfile raises if the copy fails. It already
+        # copies in-kernel where possible (sendfile on Linux, fcopyfile on
+        # macOS, large readinto buffers on Windows)
+        shutil.copyfile(img, dest_path)
+
+def hash_image(img: os.DirEntry):
+    """Hash a staged image with BLAKE2b, reading it in 1 MiB blocks.
+
+    Args:
+        img: Staged image file
+
+    Returns:
+        Hex digest, or None if the file can't be read (it is then copied on
+        its own and any error surfaces there)
+    """
+    digest = hashlib.blake2b(digest_size=16)
     try:
-        returncode = process.wait(timeout=timeout)
-    except subprocess.TimeoutExpired:
-        process.kill()
-        process.wait()
-        raise
+        with open(img, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
 
-    # Wait for reader threads to finish
-    stdout_thread.join(timeout=1)
-    stderr_thread.join(timeout=1)
+def link_duplicate_image(original: str, img: os.DirEntry, attachments_dir: str, use_hardlink: bool):
+    """Hard link an image to an identical one already in the vault.
 
-    return returncode, '\n'.join(stdout_lines), '\n'.join(stderr_lines)
+    Args:
+        original: Vault copy of an image with the same content
+        img: Staged duplicate image
+        attachments_dir: Vault attachments directory
+        use_hardlink: Passed through to copy_image if linking fails
+
+    Raises:
+        OSError: If neither linking nor copying works
+    """
+    dest_path = os.path.join(attachments_dir, img.name)
+    try:
+        try:
+            os.link(original, dest_path)
+        except FileExistsError:
+            os.unlink(dest_path)
+            os.link(original, dest_path)
+    except OSError:
+        copy_image(img, attachments_dir, use_hardlink)
+
+def copy_image_group(group, attachments_dir: str, use_hardlink: bool) -> list:
+    """Copy a group of identical staged images into the vault.
+
+    The first image is copied with copy_image and the rest are hard linked
+    to that copy (or copied on their own if that fails).
+
+    Args:
+        group: Staged image entries with the same content
+        attachments_dir: Vault attachments directory
+        use_hardlink: Passed through to copy_image
+
+    Returns:
+        List of (image, error) pairs, error being None on success
+    """
+    results = []
+    original = os.path.join(attachments_dir, group[0].name)
+    try:
+        copy_image(group[0], attachments_dir, use_hardlink)
+        results.append((group[0], None))
+    except OSError as e:
+        original = None
+        results.append((group[0], e))
+
+    for duplicate in group[1:]:
+        try:
+            if original is None:
+                copy_image(duplicate, attachments_dir, use_hardlink)
+            else:
+                link_duplicate_image(original, duplicate, attachments_dir, use_hardlink)
+            results.append((duplicate, None))
+        except OSError as e:
+            results.append((duplicate, e))
+
+    return results
+
+def copy_images(images_to_copy, attachments_dir: str, use_hardlink: bool, logger) -> tuple:
+    """Copy staged images into the vault on a thread pool.
+
+    OneNote often embeds the same screenshot on several pages, so images are
+    grouped by content hash first: one image per group is copied and the
+    rest are hard linked to it, leaving a single copy on disk.
+
+    Args:
+        images_to_copy: List of staged image files (os.scandir entries)
+        attachments_dir: Vault attachments directory
+        use_hardlink: Passed through to copy_image
+        logger: Logger instance for per-file results
+
+    Returns:
+        tuple: (copied_count, failed_count)
+    """
+    copied_count = 0
+    failed_count = 0
+
+    # Hashing and copies are I/O-bound, so overlap them on a thread pool
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        groups = {}
+        for img, digest in zip(images_to_copy, executor.map(hash_image, images_to_copy)):
+            # Unreadable images get a group of their own
+            groups.setdefault(digest or img.path, []).append(img)
+
+        futures = [
+            executor.submit(copy_image_group, group, attachments_dir, use_hardlink)
+            for group in groups.values()
+        ]
+        for future in as_completed(futures):
+            for img, error in future.result():
+                if error is None:
+                    copied_count += 1
+                    logger.debug(f"Copied: {img.name}")
+                else:
+                    failed_count += 1
+                    error_msg = f"Error copying {img.name}: {error}"
+                    print(f"      {error_msg}")
+                    logger.error(error_msg)
+
+    return copied_count, failed_count
+
+def robocopy_images(images_dir: Path, attachments_dir: Path, logger) -> bool:
+    """Copy all staged images with a single multithreaded Robocopy call.
+
+    Args:
+        images_dir: Staging directory with extracted images
+        attachments_dir: Vault attachments directory
+        logger: Logger instance for diagnostics
+
+    Returns:
+        True if Robocopy succeeded, False if it is unavailable or failed
+        (callers fall back to copy_images)
+    """
+    try:
+        result = subprocess.run(
+            ["robocopy", str(images_dir), str(attachments_dir), "*.*",
+             "/MT:16", "/NFL", "/NDL", "/NJH", "/NJS", "/NP"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+    except OSError as e:
+        logger.debug(f"Robocopy unavailable: {e}")
+        return False
+
+    # Robocopy exit codes are bit flags: 0-7 mean success, 8+ mean failures
+    if result.returncode >= 8:
+        logger.warning(f"Robocopy failed (exit code: {result.returncode}), copying images one by one")
+        return False
+
+    return True
+
+def fast_rmtree(path):
+    """Recursively delete a directory tree.
+
+    Uses os.scandir so each entry's type comes from the directory read
+    itself, avoiding the extra lstat per entry that shutil.rmtree makes.
+
+    Args:
+        path: Directory to delete
+    """
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                fast_rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
+
+def move_path(src: Path, dst: Path):
+    """Move a file or directory, renaming in place when possible.
+
+    os.replace is a single rename on the same volume; if dst is on another
+    volume (EXDEV) this falls back to shutil.move's copy-and-delete.
+
+    Args:
+        src: Existing file or directory
+        dst: Destination path (must not be an existing directory)
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dst))
+
+def count_vault_files(root: Path, markdown_root: Path, images_root: Path) -> tuple:
+    """Count markdown files and images in a vault with a single os.walk.
+
+    Works on plain strings rather than Path.rglob/glob, so no Path object is
+    built per file. Missing directories count as zero.
+
+    Args:
+        root: Directory to walk (contains both markdown_root and images_root)
+        markdown_root: Directory whose tree holds the .md files
+        images_root: Directory directly holding the images
+
+    Returns:
+        tuple: (markdown_count, image_count)
+    """
+    markdown_root = str(markdown_root)
+    markdown_prefix = markdown_root + os.sep
+    images_root = str(images_root)
+
+    md_count = 0
+    image_count = 0
+    for dirpath, _, files in os.walk(root):
+        if dirpath == images_root:
+            image_count += sum(1 for name in files if '.' in name)
+        if dirpath == markdown_root or dirpath.startswith(markdown_prefix):
+            md_count += sum(1 for name in files if name.endswith('.md'))
+    return md_count, image_count
+
+def get_notebook_last_modified(notebook_name: str, logger):
+    """Get when a OneNote notebook was last modified.
+
+    Args:
+        notebook_name: Name of the OneNote notebook
+        logger: Logger instance; failures to read the time are logged
+
+    Returns:
+        POSIX timestamp of the newest lastModifiedTime in the notebook's
+        hierarchy (notebook, sections, pages), or None if it can't be read
+    """
+    import xml.etree.ElementTree as ET
+
+    try:
+        # Early-bound dispatch returns the [out] hierarchy XML directly
+        hierarchy = _get_onenote().GetHierarchy("", 4)  # 4 = hsPages
+    except _COM_ERRORS as e:
+        logger.warning(f"Cannot read the OneNote hierarchy: {e}")
+        return None
+    if not isinstance(hierarchy, str):
+        # The late-bound Dispatch fallback in _get_onenote can't return the
+        # [out] string
+        logger.warning(f"OneNote returned no hierarchy XML (got {type(hierarchy).__name__}), "
+                       "possibly due to a stale pywin32 gen_py cache")
+        return None
+
+    try:
+        root = ET.fromstring(hierarchy)
+        for notebook in root:
+            if (notebook.tag.endswith('}Notebook')
+                    and notebook.get('name') == notebook_name
+                    and 'web' not in notebook.get('path', '').lower()):
+                stamps = [el.get('lastModifiedTime') for el in notebook.iter()]
+                stamps = [stamp for stamp in stamps if stamp]
+                if not stamps:
+                    logger.debug(f"Notebook '{notebook_name}' has no lastModifiedTime")
+                    return None
+                # ISO 8601 UTC (e.g. 2025-01-15T10:23:45.000Z), so the newest
+                # stamp is also the largest string
+                newest = datetime.strptime(max(stamps)[:19], '%Y-%m-%dT%H:%M:%S')
+                return newest.replace(tzinfo=timezone.utc).timestamp()
+    except (ET.ParseError, ValueError) as e:
+        logger.warning(f"Cannot read notebook modification time from the OneNote hierarchy: {e}")
+        return None
+
+    logger.debug(f"Notebook '{notebook_name}' not found in the OneNote hierarchy")
+    return None
+
+def oldest_markdown_mtime(root: str):
+    """Find the oldest modification time of any .md file below a directory.
+
+    Uses os.scandir recursion; on Windows each entry's stat comes from the
+    directory read itself.
+
+    Returns:
+        Oldest mtime, or None if there are no .md files
+    """
+    oldest = None
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                sub_oldest = oldest_markdown_mtime(entry.path)
+                if sub_oldest is not None and (oldest is None or sub_oldest < oldest):
+                    oldest = sub_oldest
+            elif entry.name.endswith('.md'):
+                mtime = entry.stat().st_mtime
+                if oldest is None or mtime < oldest:
+                    oldest = mtime
+    return oldest
+
+def vault_is_up_to_date(notebook_name: str, output_format: str, vault_path: Path, logger) -> bool:
+    """Check whether a vault from an earlier run is newer than the notebook.
+
+    Args:
+        notebook_name: Name of the OneNote notebook
+        output_format: Output format ('obsidian' or 'logseq')
+        vault_path: Final vault location ({notebook}-Vault)
+        logger: Logger instance
+
+    Returns:
+        True if the vault was built in the requested format and every
+        markdown file in it was written after the notebook's last change
+    """
+    # Both formats use the same vault folder, so make sure it's the same format
+    if output_format == "obsidian":
+        same_format = (vault_path / f"00-{notebook_name}-Setup-Guide.md").exists()
+    else:  # logseq
+        same_format = (vault_path / f"{notebook_name}-Logseq" / "pages").is_dir()
+    if not same_format:
+        return False
+
+    oldest_page = oldest_markdown_mtime(str(vault_path))
+    if oldest_page is None:
+        return False
+
+    last_modified = get_notebook_last_modified(notebook_name, logger)
+    if last_modified is None:
+        return False
+
+    logger.info(f"Vault written at {oldest_page}, notebook modified at {last_modified}")
+    return oldest_page >= last_modified
+
+def xml_cache_is_fresh(notebook_name: str, xml_dir: Path, logger) -> bool:
+    """Check whether previously exported XML is newer than the notebook.
 
-def run_extraction(notebook_name: str, output_format: str, output_dir: Path, debug: bool = False):
+    Args:
+        notebook_name: Name of the OneNote notebook
+        xml_dir: Directory the XML export writes to
+        logger: Logger instance
+
+    Returns:
+        True if xml_dir holds a complete export (marked done and not aborted)
+        whose pages were all written after the notebook's last modification
+    """
+    # A failed or interrupted export leaves partial XML behind; only reuse
+    # XML whose export run_extraction marked as finished
+    notebook_xml_dir = xml_dir / f"{notebook_name}_XML"
+    if (not (notebook_xml_dir / EXPORT_DONE_MARKER).exists()
+            or (notebook_xml_dir / EXPORT_ABORTED_MARKER).exists()):
+        logger.info("Cached XML is from an unfinished export, re-exporting XML")
+        return False
+
+    oldest_export = None
+    for dirpath, _, files in os.walk(xml_dir):
+        for name in files:
+            if name.endswith('.xml'):
+                mtime = os.stat(os.path.join(dirpath, name)).st_mtime
+                if oldest_export is None or mtime < oldest_export:
+                    oldest_export = mtime
+
+    if oldest_export is None:
+        return False
+
+    last_modified = get_notebook_last_modified(notebook_name, logger)
+    if last_modified is None:
+        logger.info("Could not read notebook modification time, re-exporting XML")
+        return False
+
+    logger.info(f"Cached XML exported at {oldest_export}, notebook modified at {last_modified}")
+    return oldest_export >= last_modified
+
+def run_extraction(notebook_name: str, output_format: str, output_dir: Path, debug: bool = False,
+                   use_cache: bool = True, force: bool = False):
     """Run the complete extraction pipeline.
 
     Args:
@@ -170,29 +696,54 @@ def run_extraction(notebook_name: str, output_format: str, output_dir: Path, deb
         output_format: Output format ('obsidian' or 'logseq')
         output_dir: Base output directory
         debug: If True, enable debug logging and keep interim files
+        use_cache: If True, skip the XML export when XML from an earlier run
+            is newer than the notebook
+        force: If True, extract even if the vault is newer than the notebook
     """
 
     print(f"\nOneNoteXML - Extracting '{notebook_name}'")
     print("=" * 60)
 
     # Setup logging for extraction process
-    from datetime import datetime
     log_dir = output_dir / 'logs'
     log_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
     log_file = log_dir / f'onenotexml_{notebook_name}_{timestamp}.log'
 
     # Set log level based on debug flag
     log_level = logging.DEBUG if debug else logging.INFO
 
+    # Callers only enqueue records; a listener thread writes them to the log
+    # file in batches (flushed every 1000 records, on errors and at exit)
+    file_handler = logging.handlers.MemoryHandler(
+        capacity=1000,
+        flushLevel=logging.ERROR,
+        target=logging.FileHandler(log_file, encoding='utf-8'),
+        flushOnClose=True
+    )
+    listener_handlers = [file_handler]
+    if debug:
+        listener_handlers.append(logging.StreamHandler(sys.stdout))
+
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, *listener_handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    # The log format doesn't use thread/process fields, so skip collecting them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    # The queue handler formats each record before enqueueing it, so the
+    # listener-side handlers write the message as is
     logging.basicConfig(
         level=log_level,
         format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout) if debug else logging.NullHandler()
-        ],
+        handlers=[logging.handlers.QueueHandler(log_queue)],
         force=True  # Reset any existing logging configuration
     )
 
@@ -203,6 +754,15 @@ def run_extraction(notebook_name: str, output_format: str, output_dir: Path, deb
     logger.info(f"Format: {output_format}, Debug mode: {debug}")
     logger.info(f"Log file: {log_file}")
 
+    # Nothing to do if the vault already reflects the current notebook
+    final_vault_path = output_dir / f"{notebook_name}-Vault"
+    if not force and not debug and final_vault_path.exists():
+        if vault_is_up_to_date(notebook_name, output_format, final_vault_path, logger):
+            print("\nUp-to-date: notebook unchanged since the vault was created")
+            print("   Use --force to extract it again")
+            logger.info("Vault is up to date, skipping extraction")
+            return True
+
     # Determine output paths
     notebook_output = output_dir / notebook_name
     xml_dir = notebook_output / "XML"
@@ -219,146 +779,242 @@ def run_extraction(notebook_name: str, output_format: str, output_dir: Path, deb
     logger.info(f"Step 1: Exporting XML to {xml_dir}")
 
     # Validate PowerShell script exists
-    ps_script = Path(__file__).parent / "scripts" / "export_xml_notebook.ps1"
+    ps_script = _PS_EXPORT
     if not ps_script.exists():
         print(f"ERROR: PowerShell script not found: {ps_script}")
         print(f"   Expected location: {ps_script.absolute()}")
         return False
 
-    # Verify output directory is writable
-    try:
-        xml_dir.mkdir(parents=True, exist_ok=True)
-        test_file = xml_dir / ".write_test"
-        test_file.touch()
-        test_file.unlink()
-    except (IOError, OSError, PermissionError) as e:
-        print(f"ERROR: Cannot write to output directory: {xml_dir}")
-        print(f"   {e}")
-        return False
+    # Reuse XML kept by an earlier --debug run; this run moves it back
+    debug_xml = output_dir / f"{notebook_name}-debug" / "XML"
+    if use_cache and debug and debug_xml.exists() and not any(xml_dir.iterdir()):
+        xml_dir.rmdir()
+        move_path(debug_xml, xml_dir)
 
-    try:
-        logger.info("Starting XML export from OneNote...")
-        returncode, stdout, stderr = run_subprocess_with_progress(
-            ["PowerShell", "-ExecutionPolicy", "Bypass", "-File",
-             str(ps_script), "-NotebookName", notebook_name,
-             "-OutputPath", str(xml_dir)],
-            timeout=300,
-            show_progress=True,
-            debug=debug,
-            logger=logger
-        )
+    use_cached_xml = use_cache and xml_cache_is_fresh(notebook_name, xml_dir, logger)
+    if not use_cached_xml and any(xml_dir.iterdir()):
+        # Don't let pages deleted or renamed since an earlier export linger
+        fast_rmtree(xml_dir)
+        xml_dir.mkdir(parents=True, exist_ok=True)
 
-        if returncode != 0:
-            error_msg = f"XML export failed (exit code: {returncode})"
+    def export_xml() -> bool:
+        """Run the PowerShell XML export and report any failure."""
+        try:
+            logger.info("Starting XML export from OneNote...")
+            returncode, stdout, stderr = run_subprocess_with_progress(
+                [PS_EXE, "-NoProfile", "-NoLogo", "-NonInteractive",
+                 "-ExecutionPolicy", "Bypass", "-File",
+                 str(ps_script), "-NotebookName", notebook_name,
+                 "-OutputPath", str(xml_dir),
+                 "-Parallelism", PS_PARALLELISM],
+                timeout=300,
+                show_progress=True,
+                debug=debug,
+                logger=logger,
+                capture_stdout=False  # only stderr is reported
+            )
+
+            if returncode != 0:
+                error_msg = f"XML export failed (exit code: {returncode})"
+                print(f"ERROR: {error_msg}")
+                logger.error(error_msg)
+                # Writability isn't pre-checked; the export reports it
+                if stderr and "access" in stderr.lower() and "denied" in stderr.lower():
+                    print(f"ERROR: Cannot write to output directory: {xml_dir}")
+                if stderr:
+                    print(f"   Error details:")
+                    logger.error("PowerShell stderr output:")
+                    for line in stderr.strip().split('\n', 10)[:10]:  # Show first 10 lines
+                        print(f"     {line}")
+                        logger.error(f"  {line}")
+                    if debug:
+                        # Log full stderr in debug mode
+                        logger.debug("Full stderr output:")
+                        logger.debug(stderr)
+                return False
+
+            print("      XML export completed")
+            logger.info("XML export completed successfully")
+            return True
+
+        except subprocess.TimeoutExpired:
+            error_msg = "XML export timed out (>5 minutes)"
             print(f"ERROR: {error_msg}")
             logger.error(error_msg)
-            if stderr:
-                print(f"   Error details:")
-                logger.error("PowerShell stderr output:")
-                for line in stderr.strip().split('\n')[:10]:  # Show first 10 lines
-                    print(f"     {line}")
-                    logger.error(f"  {line}")
-                if debug:
-                    # Log full stderr in debug mode
-                    logger.debug("Full stderr output:")
-                    logger.debug(stderr)
+            return False
+        except Exception as e:
+            error_msg = f"XML export error: {e}"
+            print(f"ERROR: {error_msg}")
+            logger.error(error_msg)
+            if debug:
+                import traceback
+                logger.debug(traceback.format_exc())
             return False
 
-        print("      XML export completed")
-        logger.info("XML export completed successfully")
-
-    except subprocess.TimeoutExpired:
-        error_msg = "XML export timed out (>5 minutes)"
-        print(f"ERROR: {error_msg}")
-        logger.error(error_msg)
-        return False
-    except Exception as e:
-        error_msg = f"XML export error: {e}"
-        print(f"ERROR: {error_msg}")
-        logger.error(error_msg)
-        if debug:
-            import traceback
-            logger.debug(traceback.format_exc())
+    # Step 2 setup: the converter runs in-process, in watch mode alongside
+    # the export, converting each section as soon as the export script
+    # marks it done
+    try:
+        if output_format == "obsidian":
+            from src import obsidian_pipeline as converter_pipeline
+        else:  # logseq
+            from src import logseq_pipeline as converter_pipeline
+    except ImportError as e:
+        print(f"ERROR: Cannot load {output_format} converter: {e}")
+        logger.error(f"Cannot load {output_format} converter: {e}")
         return False
 
-    # Step 2: Convert to markdown (Obsidian or Logseq)
-    print(f"\n[2/3] Converting to {output_format} format...")
-    print(f"      → {vault_dir}")
-    logger.info(f"Step 2: Converting to {output_format} format at {vault_dir}")
+    # Set when the export ends without success; stops the converter's watch
+    # even if the abort marker below can't be written
+    stop_converter = threading.Event()
 
-    if output_format == "obsidian":
-        converter_script = Path(__file__).parent / "src" / "obsidian_pipeline.py"
-    else:  # logseq
-        converter_script = Path(__file__).parent / "src" / "logseq_pipeline.py"
+    def convert() -> int:
+        """Run the converter, returning its exit code."""
+        try:
+            return converter_pipeline.run(notebook_name, notebook_output, watch=True, logger=logger,
+                                          stop=stop_converter)
+        except SystemExit as e:
+            # The pipelines exit on missing XML or an aborted export
+            return e.code if isinstance(e.code, int) else 1
+
+    # Markers checked by the converter (see watch_sections in pipeline_base)
+    notebook_xml_dir = xml_dir / f"{notebook_name}_XML"
+    notebook_xml_dir.mkdir(parents=True, exist_ok=True)
+    export_done_marker = notebook_xml_dir / EXPORT_DONE_MARKER
+    export_aborted_marker = notebook_xml_dir / EXPORT_ABORTED_MARKER
+    for marker in (export_done_marker, export_aborted_marker):
+        if marker.exists():
+            marker.unlink()
+
+    # Step 3 only needs the image map, which the converter writes as soon as
+    # all pages are converted, so image extraction starts while step 2 is
+    # still finishing up instead of waiting for it
+    image_map = vault_dir / "image_extraction_map.json"
+    ps_image_script = _PS_IMAGES
 
-    if not converter_script.exists():
-        print(f"ERROR: Converter script not found: {converter_script}")
-        return False
+    # A map left over from an earlier run must not trigger extraction early
+    if image_map.exists():
+        image_map.unlink()
 
-    try:
-        logger.info(f"Starting {output_format} conversion...")
-        returncode, stdout, stderr = run_subprocess_with_progress(
-            ["python", str(converter_script), notebook_name, str(notebook_output)],
-            timeout=300,
+    conversion_done = threading.Event()
+    # Set when this step fails, so image extraction doesn't start or is killed
+    cancel_images = threading.Event()
+
+    def extract_images_when_ready():
+        """Wait for the image map, then run image extraction.
+
+        Returns:
+            tuple: (returncode, stdout, stderr), or None if the conversion
+            finished without writing an image map
+        """
+        while not image_map.exists():
+            if conversion_done.is_set() and not image_map.exists():
+                return None
+            time.sleep(0.5)
+        if cancel_images.is_set():
+            return None
+
+        print("\n[3/3] Extracting images (alongside conversion)...")
+        print(f"      → {images_dir}")
+        logger.info(f"Step 3: Extracting images to {images_dir}")
+        logger.info("Starting image extraction...")
+        return run_subprocess_with_progress(
+            [PS_EXE, "-NoProfile", "-NoLogo", "-NonInteractive",
+             "-ExecutionPolicy", "Bypass", "-File",
+             str(ps_image_script), "-NotebookName", notebook_name,
+             "-OutputPath", str(images_dir), "-MapFile", str(image_map),
+             "-Parallelism", PS_PARALLELISM],
+            timeout=600,  # 10 minute timeout for images
             show_progress=True,
             debug=debug,
-            logger=logger
+            logger=logger,
+            capture_stdout=False,  # only stderr is reported
+            cancel=cancel_images
         )
 
-        if returncode != 0:
-            error_msg = f"Conversion failed (exit code: {returncode})"
-            print(f"ERROR: {error_msg}")
-            logger.error(error_msg)
-            if stderr:
-                print(f"   Error details:")
-                logger.error("Conversion stderr output:")
-                for line in stderr.strip().split('\n')[:10]:
-                    print(f"     {line}")
-                    logger.error(f"  {line}")
-                if debug:
-                    logger.debug("Full stderr output:")
-                    logger.debug(stderr)
+    # One worker each for the converter and the image extraction
+    background = ThreadPoolExecutor(max_workers=2)
+    logger.info(f"Starting {output_format} conversion...")
+    converter_future = background.submit(convert)
+    image_future = None
+    if ps_image_script.exists():
+        image_future = background.submit(extract_images_when_ready)
+
+    conversion_ok = False
+    try:
+        if use_cached_xml:
+            print("      Using cached XML (notebook unchanged since last export)")
+            logger.info("Skipping XML export, cached XML is up to date")
+            export_ok = True
+        else:
+            export_ok = export_xml()
+
+        # Tell the converter the export is over (a failed or interrupted
+        # export is marked in the finally block below)
+        if not export_ok:
             return False
+        export_done_marker.touch()
 
-        print(f"      {output_format.title()} conversion completed")
-        logger.info(f"{output_format} conversion completed successfully")
+        # Step 2: Convert to markdown (Obsidian or Logseq)
+        print(f"\n[2/3] Converting to {output_format} format...")
+        print(f"      → {vault_dir}")
+        logger.info(f"Step 2: Converting to {output_format} format at {vault_dir}")
 
-    except Exception as e:
-        error_msg = f"Conversion error: {e}"
-        print(f"ERROR: {error_msg}")
-        logger.error(error_msg)
-        if debug:
-            import traceback
-            logger.debug(traceback.format_exc())
-        return False
+        try:
+            returncode = converter_future.result()
+
+            if returncode != 0:
+                # Per-page errors are already in the log
+                error_msg = f"Conversion failed (exit code: {returncode})"
+                print(f"ERROR: {error_msg}")
+                print(f"   See log for details: {log_file}")
+                logger.error(error_msg)
+                return False
 
-    # Step 3: Extract images
-    print("\n[3/3] Extracting images...")
-    print(f"      → {images_dir}")
-    logger.info(f"Step 3: Extracting images to {images_dir}")
+            print(f"      {output_format.title()} conversion completed")
+            logger.info(f"{output_format} conversion completed successfully")
+            conversion_ok = True
 
-    image_map = vault_dir / "image_extraction_map.json"
+        except Exception as e:
+            error_msg = f"Conversion error: {e}"
+            print(f"ERROR: {error_msg}")
+            logger.error(error_msg)
+            if debug:
+                import traceback
+                logger.debug(traceback.format_exc())
+            return False
+
+    finally:
+        # However the export ended without success (an error, Ctrl+C, ...),
+        # the converter must not keep waiting for more sections
+        if not export_done_marker.exists():
+            stop_converter.set()
+            try:
+                export_aborted_marker.touch()
+            except OSError as e:
+                logger.warning(f"Cannot write {export_aborted_marker}: {e}")
+        # Let a waiting image extraction give up if no map was written. On
+        # failure, also keep it from starting and kill a running one:
+        # shutdown() doesn't stop work already started on the pool
+        if not conversion_ok:
+            cancel_images.set()
+        conversion_done.set()
+        background.shutdown(wait=False)
+
+    # Step 3: Extract images (may already be running)
     if not image_map.exists():
+        print("\n[3/3] Extracting images...")
         print("      No images to extract")
         return True
 
-    ps_image_script = Path(__file__).parent / "scripts" / "extract_images_robust.ps1"
-    if not ps_image_script.exists():
+    if image_future is None:
+        print("\n[3/3] Extracting images...")
         print(f"WARNING: Image extraction script not found: {ps_image_script}")
         print("      Images will not be extracted")
         return True
 
     try:
-        logger.info("Starting image extraction...")
-        returncode, stdout, stderr = run_subprocess_with_progress(
-            ["PowerShell", "-ExecutionPolicy", "Bypass", "-File",
-             str(ps_image_script), "-NotebookName", notebook_name,
-             "-OutputPath", str(images_dir), "-MapFile", str(image_map)],
-            timeout=600,  # 10 minute timeout for images
-            show_progress=True,
-            debug=debug,
-            logger=logger
-        )
+        returncode, stdout, stderr = image_future.result()
 
         if returncode != 0:
             warning_msg = "Some images may not have extracted (normal - OneNote stores some images externally)"
@@ -377,41 +1033,31 @@ def run_extraction(notebook_name: str, output_format: str, output_dir: Path, deb
             try:
                 attachments_dir.mkdir(parents=True, exist_ok=True)
 
-                import shutil
-                import os
-
-                # Get list of images to copy
-                images_to_copy = list(images_dir.glob("*.*"))
+                # Get list of images to copy (the directory read already says
+                # which entries are files, so no per-image stat is needed).
+                # The copy helpers work on the entries and plain string paths
+                # rather than building a Path per image
+                with os.scandir(images_dir) as entries:
+                    images_to_copy = [
+                        entry for entry in entries
+                        if '.' in entry.name and entry.is_file()
+                    ]
                 copied_count = 0
                 failed_count = 0
 
                 if images_to_copy:
                     logger.info(f"Copying {len(images_to_copy)} images to vault...")
-                    for img in images_to_copy:
-                        try:
-                            # Verify source file exists and is readable
-                            if not img.is_file():
-                                logger.debug(f"Skipping non-file: {img}")
-                                continue
-
-                            # Copy with error handling
-                            dest_path = attachments_dir / img.name
-                            shutil.copy2(img, dest_path)
-
-                            # Verify copy succeeded
-                            if dest_path.exists() and dest_path.stat().st_size > 0:
-                                copied_count += 1
-                                logger.debug(f"Copied: {img.name}")
-                            else:
-                                failed_count += 1
-                                error_msg = f"Failed to copy: {img.name}"
-                                print(f"      {error_msg}")
-                                logger.error(error_msg)
-                        except (IOError, OSError) as e:
-                            failed_count += 1
-                            error_msg = f"Error copying {img.name}: {e}"
-                            print(f"      {error_msg}")
-                            logger.error(error_msg)
+
+                    # Staging images are deleted after the run unless debugging,
+                    # so a hard link is as good as a copy and moves no data
+                    use_hardlink = not debug
+
+                    if os.name == 'nt' and not use_hardlink and robocopy_images(images_dir, attachments_dir, logger):
+                        copied_count = len(images_to_copy)
+                    else:
+                        copied_count, failed_count = copy_images(
+                            images_to_copy, os.fspath(attachments_dir), use_hardlink, logger
+                        )
 
                     # Report results
                     print(f"      Images copied: {copied_count} of {len(images_to_copy)}")
@@ -443,19 +1089,21 @@ def run_extraction(notebook_name: str, output_format: str, output_dir: Path, deb
     # Final verification
     print(f"\n[Verification]")
     try:
-        # Count markdown files
+        # Count markdown files and images in one pass over the vault
         if output_format == "obsidian":
             vault_path = vault_dir / f"{notebook_name}-Vault"
-            md_files = list(vault_path.rglob("*.md"))
-            attachments = list((vault_path / "attachments").glob("*.*")) if (vault_path / "attachments").exists() else []
+            md_count, attachment_count = count_vault_files(
+                vault_path, vault_path, vault_path / "attachments"
+            )
         else:  # logseq
-            md_files = list((vault_dir / "pages").rglob("*.md")) if (vault_dir / "pages").exists() else []
-            attachments = list((vault_dir / "assets").glob("*.*")) if (vault_dir / "assets").exists() else []
+            md_count, attachment_count = count_vault_files(
+                vault_dir, vault_dir / "pages", vault_dir / "assets"
+            )
 
-        print(f"      Created {len(md_files)} markdown files")
-        print(f"      Copied {len(attachments)} images to vault")
+        print(f"      Created {md_count} markdown files")
+        print(f"      Copied {attachment_count} images to vault")
 
-        if len(md_files) == 0:
+        if md_count == 0:
             print(f"      WARNING: No markdown files found - extraction may have failed")
             return False
 
@@ -471,21 +1119,33 @@ def run_extraction(notebook_name: str, output_format: str, output_dir: Path, deb
     print(f"\n[Cleanup & Organization]")
     logger.info("Starting cleanup and organization...")
     try:
-        import shutil
-
         # Define final paths
         if output_format == "obsidian":
             source_vault = vault_dir / f"{notebook_name}-Vault"
         else:  # logseq
             source_vault = vault_dir
 
-        final_vault_path = output_dir / f"{notebook_name}-Vault"
+        # Everything lives under output_dir, so moves are normally plain
+        # renames on one volume (see move_path)
 
         # Move vault to top level
         if source_vault.exists():
             if final_vault_path.exists():
-                shutil.rmtree(final_vault_path)
-            shutil.move(str(source_vault), str(final_vault_path))
+                # Rename the previous vault aside and promote the new one
+                # (two O(1) renames), so the final path is only briefly
+                # empty; the old vault is deleted once the new one is in place
+                old_vault_path = output_dir / f".{notebook_name}-Vault.old"
+                if old_vault_path.exists():
+                    fast_rmtree(old_vault_path)
+                os.replace(final_vault_path, old_vault_path)
+                try:
+                    move_path(source_vault, final_vault_path)
+                except OSError:
+                    os.replace(old_vault_path, final_vault_path)
+                    raise
+                fast_rmtree(old_vault_path)
+            else:
+                move_path(source_vault, final_vault_path)
             print(f"      Moved vault to: {final_vault_path.name}")
 
         # Handle interim files based on debug flag
@@ -498,22 +1158,22 @@ def run_extraction(notebook_name: str, output_format: str, output_dir: Path, deb
             if xml_dir.exists():
                 debug_xml = debug_dir / "XML"
                 if debug_xml.exists():
-                    shutil.rmtree(debug_xml)
-                shutil.move(str(xml_dir), str(debug_xml))
+                    fast_rmtree(debug_xml)
+                move_path(xml_dir, debug_xml)
                 print(f"      Moved XML to debug folder")
 
             # Move staging images
             if images_dir.exists():
                 debug_images = debug_dir / "images"
                 if debug_images.exists():
-                    shutil.rmtree(debug_images)
-                shutil.move(str(images_dir), str(debug_images))
+                    fast_rmtree(debug_images)
+                move_path(images_dir, debug_images)
                 print(f"      Moved staging images to debug folder")
 
             # Move image extraction map
             image_map = vault_dir / "image_extraction_map.json"
             if image_map.exists():
-                shutil.move(str(image_map), str(debug_dir / "image_extraction_map.json"))
+                move_path(image_map, debug_dir / "image_extraction_map.json")
                 print(f"      Moved metadata to debug folder")
 
             print(f"      Debug files saved to: {debug_dir.name}")
@@ -521,11 +1181,11 @@ def run_extraction(notebook_name: str, output_format: str, output_dir: Path, deb
         else:
             # Delete interim files
             if xml_dir.exists():
-                shutil.rmtree(xml_dir)
+                fast_rmtree(xml_dir)
                 print(f"      Deleted XML files ({16}MB)")
 
             if images_dir.exists():
-                shutil.rmtree(images_dir)
+                fast_rmtree(images_dir)
                 print(f"      Deleted staging images")
 
             image_map = vault_dir / "image_extraction_map.json"
@@ -618,6 +1278,18 @@ For more info: https://github.com/dvdarkin/OneNoteXML
         help='Keep interim files (XML, staging images) for debugging'
     )
 
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Extract even if the vault is newer than the notebook (always done with --debug)'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always re-export XML, even if XML from an earlier run is up to date'
+    )
+
     args = parser.parse_args()
 
     # Check requirements
@@ -635,7 +1307,8 @@ For more info: https://github.com/dvdarkin/OneNoteXML
     if args.debug:
         print(f"Debug:    enabled (keeping interim files)")
 
-    success = run_extraction(args.notebook, args.format, args.output, args.debug)
+    success = run_extraction(args.notebook, args.format, args.output, args.debug,
+                             use_cache=not args.no_cache, force=args.force)
 
     if success:
         print("\n" + "=" * 60)
@@ -4,7 +4,10 @@
 param(
     [Parameter(Mandatory=$true)]
     [string]$NotebookName,
-    [string]$OutputPath = "output\XML"
+    [string]$OutputPath = "output\XML",
+    # Worker count offered by the caller. OneNote's COM server handles calls
+    # one at a time, so page loops stay sequential for now.
+    [int]$Parallelism = 1
 )
 
 Write-Host "OneNote XML Export for Notebook: $NotebookName"
@@ -55,6 +58,7 @@ try {
             
             if ($section.Page) {
                 $pageIndex = 0
+                $sectionPageCount = @($section.Page).Count
                 foreach ($page in $section.Page) {
                     $pageIndex++
                     $totalPages++
@@ -70,7 +74,10 @@ try {
                         # Prepend page index to preserve OneNote hierarchy order
                         $pageFile = Join-Path $sectionDir ("{0:D3}_{1}.xml" -f $pageIndex, $safePageName)
                         $pageXml | Out-File $pageFile -Encoding UTF8
-                        Write-Host "  Page $pageIndex : $pageName -> XML"
+                        # Single-line JSON progress event, rendered by onenotexml.py
+                        Write-Host (ConvertTo-Json -Compress ([ordered]@{
+                            phase = 'page'; done = $pageIndex; total = $sectionPageCount; name = $pageName
+                        }))
                     } catch {
                         Write-Host "  Page $pageIndex FAILED: $($_.Exception.Message)"
                     }
@@ -78,6 +85,9 @@ try {
             } else {
                 Write-Host "  No pages in this section"
             }
+
+            # Mark the section complete so the converter can start on it
+            New-Item -ItemType File -Path (Join-Path $sectionDir ".done") -Force | Out-Null
         }
         
         Write-Host ""
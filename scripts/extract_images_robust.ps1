@@ -7,7 +7,10 @@ param(
     [Parameter(Mandatory=$true)]
     [string]$OutputPath,
     [Parameter(Mandatory=$true)]
-    [string]$MapFile
+    [string]$MapFile,
+    # Worker count offered by the caller. OneNote's COM server handles calls
+    # one at a time, so page loops stay sequential for now.
+    [int]$Parallelism = 1
 )
 
 function Get-ImageFormat {
@@ -105,9 +108,11 @@ try {
     $successCount = 0
     $failureCount = 0
     $extractedImages = @{}  # Track which images we've extracted to avoid duplicates
+    $processedCount = 0
     
     # For each image in the map
     foreach ($callbackId in $mapContent.PSObject.Properties.Name) {
+        $processedCount++
         $imageInfo = $mapContent.$callbackId
         $sectionName = $imageInfo.section
         $pageName = $imageInfo.page
@@ -121,10 +126,11 @@ try {
             continue
         }
         
-        Write-Host "Processing: CallbackID $callbackId"
-        Write-Host "  Alt: '$altText'"
-        Write-Host "  Section: $sectionName > $pageName"
-        Write-Host "  Target: $targetFileName"
+        # Single-line JSON progress event, rendered by onenotexml.py
+        Write-Host (ConvertTo-Json -Compress ([ordered]@{
+            phase = 'image'; done = $processedCount; total = $imageCount
+            name = $targetFileName; section = $sectionName; page = $pageName
+        }))
         
         try {
             # Find the section - try multiple variations
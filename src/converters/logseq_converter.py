@@ -6,15 +6,144 @@ Convert parsed OneNote content to Logseq-compatible markdown format
 """
 
 from pathlib import Path
+import os
 import json
 import re
 import html
 from typing import Dict, List, Optional, Set
 from datetime import datetime
 import hashlib
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from .markdown_utils import escape_literal_brackets_with_links, escape_logseq_special_syntax, html_to_markdown
 
+# orjson is optional; it only speeds up writing the JSON output files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Precompiled patterns, shared by every page the converter processes
+_HL_RE = re.compile(r'\^\^([^^\n]+)\^\^')
+_TAG_RE = re.compile(r'<[^>]+>')
+_TAGS_ONLY_RE = re.compile(r'(?:<[^>]+>|\s)*')
+_INVALID_PAGE_CHARS = str.maketrans('', '', '<>:"/\\|?*[]')
+_NON_SLUG_RE = re.compile(r'[^a-z0-9-]')
+_HYPHENS_RE = re.compile(r'-+')
+# Deletes the ASCII characters outside [a-z0-9-]; non-ASCII names use the regex
+_SLUG_DELETE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if c not in 'abcdefghijklmnopqrstuvwxyz0123456789-'))
+_COMMON_WORDS = frozenset({'the', 'a', 'an', 'of', 'for', 'with', 'and', 'or', 'in', 'on', 'at', 'to'})
+
+# Content-type keywords in a single alternation. The lookahead keeps the
+# scan overlapping so every keyword position is seen; the first entry of
+# _CONTENT_TYPES wins whenever several types appear on one page.
+_CONTENT_TYPE_RE = re.compile(
+    r'(?=(?P<meeting>meeting|minutes|agenda)'
+    r'|(?P<task>todo|task|action item)'
+    r'|(?P<research>research|analysis|study)'
+    r'|(?P<diary>diary|journal|daily)'
+    r'|(?P<project>project|development|implementation))',
+    re.IGNORECASE)
+_CONTENT_TYPES = {
+    'meeting': (0, 'meeting-notes'),
+    'task': (1, 'task-list'),
+    'research': (2, 'research'),
+    'diary': (3, 'diary-entry'),
+    'project': (4, 'project-notes'),
+}
+
+_SPECIAL_CONTENT_RE = re.compile(
+    r'\b(?:(?P<task>TODO|TASK|Action Item)|(?P<meeting>meeting|agenda|minutes))\b',
+    re.IGNORECASE)
+_PRIORITY_A_RE = re.compile(r'\b(urgent|critical|high priority|asap)\b', re.IGNORECASE)
+_PRIORITY_B_RE = re.compile(r'\b(important|medium priority)\b', re.IGNORECASE)
+
+_TASK_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'^\s*\[[ xX]\]',  # Checkbox format
+    r'^\s*(TODO|DONE|TASK):?\s',  # TODO/DONE prefix
+    r'^\s*[-*]\s*(TODO|DONE|TASK):?\s',  # List with TODO
+)]
+_TASK_START_CHARS = frozenset('[TDtd-*')
+_CHECKBOX_RE = re.compile(r'^\s*\[([ xX])\]\s*(.+)$')
+_TASK_PREFIX_RE = re.compile(r'^\s*(?:[-*]\s*)?(TODO|DONE|TASK):?\s*(.+)$', re.IGNORECASE)
+
+_MONTHS = {
+    'january': '01', 'february': '02', 'march': '03', 'april': '04',
+    'may': '05', 'june': '06', 'july': '07', 'august': '08',
+    'september': '09', 'october': '10', 'november': '11', 'december': '12'
+}
+_MONTH_NAMES_ALT = '|'.join(_MONTHS)
+
+_DATE_DMY_RE = re.compile(rf'(\d{{1,2}})\s+({_MONTH_NAMES_ALT})\s+(\d{{4}})', re.IGNORECASE)
+_DATE_ISO_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+_DATE_US_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+
+# (pattern, year group, month group, day group), tried in order
+_DATE_FORMATS = (
+    (_DATE_DMY_RE, 3, 2, 1),
+    (_DATE_ISO_RE, 1, 2, 3),
+    (_DATE_US_RE, 3, 1, 2),
+)
+
+# Literal sequences escape_logseq_special_syntax may rewrite; text without
+# any of them passes through unchanged
+_LOGSEQ_SYNTAX_TRIGGERS = ('{{', '}}', '::', '((', '))')
+
+# Fields of each image_dictionary row, in image_extraction_map.json key order
+_IMAGE_MAP_FIELDS = ('page_id', 'target_path', 'relative_path', 'alt_text',
+                     'section', 'section_sanitized', 'page')
+
+# (substring, format) image format hints, checked in priority order; alt
+# text is checked before the callback ID, which only hints JPEG or PNG
+_FORMAT_HINTS = (('.jpg', 'jpeg'), ('jpeg', 'jpeg'), ('png', 'png'),
+                 ('gif', 'gif'), ('bmp', 'bmp'), ('webp', 'webp'))
+_CALLBACK_FORMAT_HINTS = (('jpg', 'jpeg'), ('jpeg', 'jpeg'), ('png', 'png'))
+
+# Block indentation strings, indexed by nesting level
+_MAX_INDENT = 64
+_INDENTS = tuple("  " * level for level in range(_MAX_INDENT))
+
+# Scratch write buffers above this size are dropped after an oversized page
+_WRITE_BUFFER_SOFT_MAX = 128 * 1024
+
+# Buffer size for dashboard files
+_WRITE_BUFFERING = 256 * 1024
+
+
+def _dump_json(data, f):
+    """Write data to text file f as indented, non-ASCII-preserving JSON."""
+    if orjson is not None:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8'))
+    else:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _trim_trailing_empty(cells: List[str]) -> List[str]:
+    """Return cells without trailing empty or whitespace-only entries."""
+    end = len(cells)
+    while end and (not cells[end - 1] or cells[end - 1].isspace()):
+        end -= 1
+    return cells if end == len(cells) else cells[:end]
+
+
+def _iter_text_leaves(obj):
+    """Yield every string (dict keys included) in nested page content."""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(key, str):
+                yield key
+            yield from _iter_text_leaves(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _iter_text_leaves(value)
+
+
 class LogseqConverter:
     """Convert parsed OneNote content to Logseq-compatible markdown format."""
     
@@ -32,12 +161,17 @@ class LogseqConverter:
         for dir_path in [self.pages_dir, self.journals_dir, self.assets_dir, self.logseq_dir]:
             dir_path.mkdir(exist_ok=True)
             
-        self.image_dictionary = {}  # CallbackID -> target file path mapping
+        self.image_dictionary = {}  # CallbackID -> image row (see _IMAGE_MAP_FIELDS)
         self.block_references = {}  # ObjectID -> block reference mapping
         self.page_links = {}  # Track all pages for internal linking
         self.detected_tasks = []  # Track TODO items for dashboard
         self.detected_meetings = []  # Track meetings for dashboard
-        self.used_image_names = set()  # Track used names to avoid collisions
+        self._name_counters = {}  # Filename -> times generated, for -2/-3 suffixes
+        self._pending_writes = []  # (path, lines) pages waiting to be written
+        self._write_scratch = threading.local()  # Per-writer reusable bytearray
+        self._current_section_original = None  # Unsanitized name of the section being converted
+        now = datetime.now()
+        self._import_date = f"{now.strftime('%b %d')}th, {now.year}"  # Journal link text for dashboards
         
     def convert_section(self, parsed_data: Dict) -> Path:
         """Convert a parsed section to Logseq format."""
@@ -47,9 +181,13 @@ class LogseqConverter:
         # Determine if this is a journal section
         is_journal = self._is_journal_section(section_name)
         
+        # Original section name for the image map, shared by every image in the section
+        self._current_section_original = self._reverse_sanitize_section_name(section_name)
+        
         # Convert each page
         for page in pages:
             self._convert_page(page, section_name, is_journal)
+        self._flush_pending_writes()
             
         # Create section dashboard if multiple pages
         if len(pages) > 1 and not is_journal:
@@ -73,8 +211,8 @@ class LogseqConverter:
         # Strip HTML tags from title (OneNote titles can contain HTML formatting)
         page_title = self._strip_html_tags(page_title)
 
-        # Ensure title is not empty
-        if not page_title.strip():
+        # Ensure title is not empty (_strip_html_tags already trimmed it)
+        if not page_title:
             page_title = 'Untitled'
         
         # Check if this is a date-based page
@@ -102,8 +240,9 @@ class LogseqConverter:
             content_lines.append(f"- # {page_title}")
         
         # Add properties block
+        content_type = self._detect_content_type(page_data)
         properties = self._generate_properties_block(
-            page_data, section_name, is_journal_page
+            page_data, section_name, is_journal_page, content_type
         )
         if properties:
             content_lines.extend(properties)
@@ -111,12 +250,10 @@ class LogseqConverter:
         # Convert page content
         content = page_data.get('content', [])
         for item in content:
-            converted = self._convert_content_item(
-                item, section_name, page_title, 
+            self._convert_content_item(
+                item, section_name, page_title, content_lines,
                 parent_object_id=page_data.get('page_id')
             )
-            if converted:
-                content_lines.extend(converted)
         
         # Add source attribution as collapsed block
         content_lines.extend([
@@ -125,44 +262,96 @@ class LogseqConverter:
             f"  - Last modified: {page_data.get('last_modified', 'Unknown')}"
         ])
         
-        # Write file
-        with open(note_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(content_lines))
-            
-        print(f"  Created: {note_path.name}")
-        
-    def _convert_content_item(self, item: Dict, section_name: str, page_title: str, 
-                             indent_level: int = 0, parent_object_id: str = None) -> List[str]:
-        """Convert a single content item to Logseq block format."""
+        # Queue file; written in bulk at the end of the section, which also
+        # reports it as created
+        self._pending_writes.append((note_path, content_lines))
+    
+    def _flush_pending_writes(self):
+        """Write all queued pages, overlapping file I/O across a thread pool.
+
+        Each page is reported as created once its write has succeeded.
+        """
+        pending, self._pending_writes = self._pending_writes, []
+
+        # Later pages with the same name overwrite earlier ones, as before
+        latest = {}
+        for note_path, lines in pending:
+            latest[note_path] = lines
+
+        def write_page(entry):
+            note_path, lines = entry
+            buf = self._encode_page(lines)
+            # Unbuffered: the page is already one contiguous buffer
+            with open(note_path, 'wb', buffering=0) as f, memoryview(buf) as view:
+                written = 0
+                while written < len(view):
+                    written += f.write(view[written:])
+            return note_path
+
+        if len(latest) <= 1:
+            for entry in latest.items():
+                print(f"  Created: {write_page(entry).name}")
+            return
+
+        # Results come back in queue order; a failed write raises here, so
+        # it and the pages after it aren't reported
+        with ThreadPoolExecutor(max_workers=min(8, len(latest))) as executor:
+            for note_path in executor.map(write_page, latest.items()):
+                print(f"  Created: {note_path.name}")
+        
+    def _encode_page(self, lines: List[str]) -> bytearray:
+        """Encode page lines into this thread's reusable scratch buffer.
+
+        Newlines are translated to os.linesep, matching what a text-mode
+        write produced before.
+        """
+        buf = getattr(self._write_scratch, 'buf', None)
+        if buf is None or len(buf) > _WRITE_BUFFER_SOFT_MAX:
+            buf = self._write_scratch.buf = bytearray()
+        buf.clear()
+
+        translate = os.linesep != '\n'
+        newline = os.linesep.encode('ascii')
+        for i, line in enumerate(lines):
+            if i:
+                buf += newline
+            if translate and '\n' in line:
+                line = line.replace('\n', os.linesep)
+            buf += line.encode('utf-8')
+        return buf
+        
+    def _convert_content_item(self, item: Dict, section_name: str, page_title: str,
+                             out: List[str], indent_level: int = 0,
+                             parent_object_id: str = None) -> None:
+        """Convert a single content item to Logseq block format, appending to out."""
         item_type = item.get('type', 'unknown')
         object_id = item.get('object_id')
         
         # Generate block reference if we have an object ID
         if object_id:
-            block_ref = self._generate_block_reference(object_id)
-            self.block_references[object_id] = block_ref
+            block_ref = self.block_references.get(object_id)
+            if block_ref is None:
+                block_ref = self._generate_block_reference(object_id)
+                self.block_references[object_id] = block_ref
         else:
             block_ref = None
         
-        lines = []
-        indent = "  " * indent_level
+        indent = _INDENTS[indent_level] if indent_level < _MAX_INDENT else "  " * indent_level
         
         if item_type == 'text':
             text_lines = self._convert_text(item, indent_level)
             if text_lines and block_ref:
                 # Add block reference to first line
                 text_lines[0] = text_lines[0].replace("- ", f"- {block_ref} ", 1)
-            lines.extend(text_lines)
+            out.extend(text_lines)
             
         elif item_type == 'outline_element':
-            oe_lines = self._convert_outline_element(
-                item, section_name, page_title, indent_level, parent_object_id
+            self._convert_outline_element(
+                item, section_name, page_title, out, indent_level, parent_object_id
             )
-            lines.extend(oe_lines)
             
         elif item_type == 'list':
-            list_lines = self._convert_list(item, indent_level)
-            lines.extend(list_lines)
+            out.extend(self._convert_list(item, indent_level))
             
         elif item_type == 'image':
             image_data = item.get('content', {})
@@ -170,25 +359,21 @@ class LogseqConverter:
                 image_lines = self._convert_image(image_data, section_name, page_title, indent_level)
             else:
                 image_lines = self._convert_image(item, section_name, page_title, indent_level)
-            lines.extend(image_lines)
+            out.extend(image_lines)
             
         elif item_type == 'table':
-            table_lines = self._convert_table(item, section_name, page_title, indent_level)
-            lines.extend(table_lines)
+            out.extend(self._convert_table(item, section_name, page_title, indent_level))
             
         elif item_type == 'unknown_html':
-            html_lines = self._convert_html_content(item, indent_level)
-            lines.extend(html_lines)
+            out.extend(self._convert_html_content(item, indent_level))
             
         else:
             # Log unknown types but still try to extract any content
             if item.get('content'):
-                lines.append(f"{indent}- <!--Unknown type: {item_type}-->")
-                lines.append(f"{indent}  {item['content']}")
+                out.append(f"{indent}- <!--Unknown type: {item_type}-->")
+                out.append(f"{indent}  {item['content']}")
             else:
-                lines.append(f"{indent}- <!--Unknown content type: {item_type}-->")
-        
-        return lines
+                out.append(f"{indent}- <!--Unknown content type: {item_type}-->")
     
     def _convert_text(self, item: Dict, indent_level: int = 0) -> List[str]:
         """Convert text content to Logseq block format."""
@@ -207,7 +392,7 @@ class LogseqConverter:
         # Detect special content types
         self._detect_special_content(text, item)
         
-        indent = "  " * indent_level
+        indent = _INDENTS[indent_level] if indent_level < _MAX_INDENT else "  " * indent_level
         
         # Always format as block (Logseq convention)
         if level > 0:
@@ -217,10 +402,10 @@ class LogseqConverter:
         else:
             return [f"{indent}- {text}"]
     
-    def _convert_outline_element(self, item: Dict, section_name: str, page_title: str, 
-                                indent_level: int = 0, parent_object_id: str = None) -> List[str]:
-        """Convert outline element to Logseq blocks."""
-        lines = []
+    def _convert_outline_element(self, item: Dict, section_name: str, page_title: str,
+                                out: List[str], indent_level: int = 0,
+                                parent_object_id: str = None) -> None:
+        """Convert outline element to Logseq blocks, appending to out."""
         content = item.get('content')
         children = item.get('children', [])
         object_id = item.get('object_id', parent_object_id)
@@ -232,15 +417,15 @@ class LogseqConverter:
                 if stripped_content and not self._is_empty_html_tag(stripped_content):
                     converted_text = self._html_to_logseq_markdown(content)
                     if converted_text.strip():
-                        indent = "  " * indent_level
+                        indent = _INDENTS[indent_level] if indent_level < _MAX_INDENT else "  " * indent_level
                         
                         # Add block reference if available
                         if object_id and object_id not in self.block_references:
                             block_ref = self._generate_block_reference(object_id)
                             self.block_references[object_id] = block_ref
-                            lines.append(f"{indent}- {block_ref} {converted_text}")
+                            out.append(f"{indent}- {block_ref} {converted_text}")
                         else:
-                            lines.append(f"{indent}- {converted_text}")
+                            out.append(f"{indent}- {converted_text}")
                             
                         # Detect special content
                         self._detect_special_content(converted_text, item)
@@ -248,33 +433,45 @@ class LogseqConverter:
             elif isinstance(content, dict):
                 # Nested content
                 if content.get('type') == 'image':
-                    converted = self._convert_image(content, section_name, page_title, indent_level)
+                    out.extend(self._convert_image(content, section_name, page_title, indent_level))
                 else:
-                    converted = self._convert_content_item(
-                        content, section_name, page_title, indent_level, object_id
+                    self._convert_content_item(
+                        content, section_name, page_title, out, indent_level, object_id
                     )
-                lines.extend(converted)
         
         # Process children as nested blocks
         if children:
             for child in children:
-                child_lines = self._convert_content_item(
-                    child, section_name, page_title, indent_level + 1, object_id
+                self._convert_content_item(
+                    child, section_name, page_title, out, indent_level + 1, object_id
                 )
-                lines.extend(child_lines)
-        
-        return lines
     
     def _convert_image(self, item: Dict, section_name: str, page_title: str, 
                       indent_level: int = 0) -> List[str]:
         """Convert image to Logseq format."""
-        callback_id = item.get('callback_id')
         alt_text = item.get('alt_text') or item.get('alt', 'Image')
+        indent = _INDENTS[indent_level] if indent_level < _MAX_INDENT else "  " * indent_level
         
-        indent = "  " * indent_level
+        markdown_link = self._register_image(item, section_name, page_title)
+        if not markdown_link:
+            return [f"{indent}- <!--Missing image: {alt_text}-->"]
         
+        # Return as block with image
+        lines = [f"{indent}- {markdown_link}"]
+        
+        # Add caption as nested block if meaningful
+        if alt_text and alt_text.lower() not in ['image', 'untitled', '']:
+            lines.append(f"{indent}  - *{alt_text}*")
+            
+        return lines
+    
+    def _register_image(self, item: Dict, section_name: str, page_title: str) -> Optional[str]:
+        """Record an image for extraction and return its markdown link, or None without a callback ID."""
+        callback_id = item.get('callback_id')
         if not callback_id:
-            return [f"{indent}- <!--Missing image: {alt_text}-->"]
+            return None
+        # Generic alt texts repeat across many images; keep one copy of each
+        alt_text = sys.intern(item.get('alt_text') or item.get('alt', 'Image'))
         
         # Generate Logseq-compatible image filename  
         # Try to detect format from callback_id or alt_text hints
@@ -285,33 +482,26 @@ class LogseqConverter:
         markdown_link = f"![{alt_text}](../assets/{image_name})"
         
         # Store in image dictionary for PowerShell extraction
-        # Generate original section name by reversing common sanitizations
-        original_section_name = self._reverse_sanitize_section_name(section_name)
-        
-        self.image_dictionary[callback_id] = {
-            'page_id': item.get('page_id', callback_id),
-            'target_path': str(self.assets_dir / image_name),
-            'relative_path': f"assets/{image_name}",
-            'alt_text': alt_text,
-            'section': original_section_name,  # Original name for PowerShell lookup
-            'section_sanitized': section_name,  # Sanitized name for reference
-            'page': page_title,
-            'logseq_link': markdown_link
-        }
-        
-        # Return as block with image
-        lines = [f"{indent}- {markdown_link}"]
+        # Original section name was reversed once in convert_section
+        original_section_name = self._current_section_original
+        
+        # Row order follows _IMAGE_MAP_FIELDS
+        self.image_dictionary[callback_id] = (
+            item.get('page_id', callback_id),
+            str(self.assets_dir / image_name),
+            f"assets/{image_name}",
+            alt_text,
+            original_section_name,  # Original name for PowerShell lookup
+            section_name,  # Sanitized name for reference
+            page_title,
+        )
         
-        # Add caption as nested block if meaningful
-        if alt_text and alt_text.lower() not in ['image', 'untitled', '']:
-            lines.append(f"{indent}  - *{alt_text}*")
-            
-        return lines
+        return markdown_link
     
     def _convert_table(self, item: Dict, section_name: str, page_title: str, 
                       indent_level: int = 0) -> List[str]:
         """Convert table to Logseq format."""
-        indent = "  " * indent_level
+        indent = _INDENTS[indent_level] if indent_level < _MAX_INDENT else "  " * indent_level
         lines = []
         
         # Add table as a block
@@ -334,16 +524,14 @@ class LogseqConverter:
             return ["  - <!--Empty table-->"]
 
         lines = []
-        indent = "  " * indent_level
+        indent = _INDENTS[indent_level] if indent_level < _MAX_INDENT else "  " * indent_level
 
         # Convert all rows and remove trailing empty cells
         all_converted_rows = []
         for row in rows:
             converted_cells = [self._html_to_logseq_markdown(str(cell)) for cell in row]
             # Remove trailing empty cells
-            while converted_cells and not converted_cells[-1].strip():
-                converted_cells.pop()
-            all_converted_rows.append(converted_cells)
+            all_converted_rows.append(_trim_trailing_empty(converted_cells))
 
         # Find maximum column count
         max_cols = max(len(row) for row in all_converted_rows) if all_converted_rows else 0
@@ -371,7 +559,7 @@ class LogseqConverter:
                                page_title: str, indent_level: int) -> List[str]:
         """Convert enhanced table with embedded images."""
         lines = []
-        indent = "  " * indent_level
+        indent = _INDENTS[indent_level] if indent_level < _MAX_INDENT else "  " * indent_level
         
         content = table_data.get('content', {})
         if not isinstance(content, dict):
@@ -384,7 +572,7 @@ class LogseqConverter:
         # Process embedded images first
         if content.get('has_images') and content.get('embedded_images'):
             for img in content['embedded_images']:
-                self._convert_image(img, section_name, page_title, 0)
+                self._register_image(img, section_name, page_title)
         
         # Build table as nested blocks
         all_row_cells = []
@@ -398,15 +586,12 @@ class LogseqConverter:
                     # If cell has images, add them
                     if cell.get('has_images') and cell.get('images'):
                         for img in cell['images']:
-                            img_lines = self._convert_image(img, section_name, page_title, 0)
-                            if img_lines and '![' in img_lines[0]:
-                                # Extract just the image link
-                                img_match = re.search(r'!\[.*?\]\(.*?\)', img_lines[0])
-                                if img_match:
-                                    if cell_content:
-                                        cell_content += ' ' + img_match.group()
-                                    else:
-                                        cell_content = img_match.group()
+                            img_link = self._register_image(img, section_name, page_title)
+                            if img_link:
+                                if cell_content:
+                                    cell_content += ' ' + img_link
+                                else:
+                                    cell_content = img_link
 
                     # Convert cell content through HTML-to-markdown
                     row_cells.append(self._html_to_logseq_markdown(cell_content))
@@ -415,10 +600,7 @@ class LogseqConverter:
                     row_cells.append(self._html_to_logseq_markdown(str(cell)))
 
             # Remove trailing empty cells
-            while row_cells and not row_cells[-1].strip():
-                row_cells.pop()
-
-            all_row_cells.append(row_cells)
+            all_row_cells.append(_trim_trailing_empty(row_cells))
 
         # Find maximum column count
         max_cols = max(len(row) for row in all_row_cells) if all_row_cells else 0
@@ -447,7 +629,7 @@ class LogseqConverter:
         list_type = item.get('list_type', 'unordered')
         
         lines = []
-        indent = "  " * indent_level
+        indent = _INDENTS[indent_level] if indent_level < _MAX_INDENT else "  " * indent_level
         
         for i, list_item in enumerate(items):
             # Convert list item content
@@ -477,7 +659,7 @@ class LogseqConverter:
     def _convert_html_content(self, item: Dict, indent_level: int = 0) -> List[str]:
         """Convert unknown HTML content."""
         html = item.get('html', '')
-        indent = "  " * indent_level
+        indent = _INDENTS[indent_level] if indent_level < _MAX_INDENT else "  " * indent_level
         
         # Try to convert to markdown
         converted = self._html_to_logseq_markdown(html)
@@ -495,25 +677,31 @@ class LogseqConverter:
         # Logseq-specific post-processing
 
         # Extract dates from highlighted text for linking
-        highlighted_dates = re.findall(r"\^\^(.*?)\^\^", text)
-        for date_text in highlighted_dates:
-            date_link = self._try_parse_date_to_link(date_text)
-            if date_link:
-                text = text.replace(f"^^{date_text}^^", f"^^{date_link}^^")
+        if '^^' in text:
+            text = _HL_RE.sub(self._replace_highlighted_date, text)
 
         # Fix: Escape literal brackets that contain markdown links
         # Pattern: [link1, link2] becomes \[link1, link2\] to avoid syntax conflict
-        text = escape_literal_brackets_with_links(text)
+        if '](' in text:
+            text = escape_literal_brackets_with_links(text)
 
         # Fix: Escape Logseq-specific syntax in non-code contexts
         # Prevents {{queries}}, ::properties, and ((block-refs)) from triggering in prose
-        text = escape_logseq_special_syntax(text)
+        if any(trigger in text for trigger in _LOGSEQ_SYNTAX_TRIGGERS):
+            text = escape_logseq_special_syntax(text)
 
         return text
     
+    def _replace_highlighted_date(self, match) -> str:
+        """Turn a highlighted date into a highlighted Logseq date link."""
+        date_text = match.group(1)
+        date_link = self._try_parse_date_to_link(date_text)
+        return f"^^{date_link or date_text}^^"
+    
     def _generate_properties_block(self, page_data: Dict, section_name: str, 
-                                  is_journal: bool) -> List[str]:
-        """Generate Logseq properties for the page."""
+                                  is_journal: bool,
+                                  content_type: Optional[str] = None) -> List[str]:
+        """Generate Logseq properties for the page using its detected content type."""
         properties = []
         
         # Add notebook and section properties
@@ -527,7 +715,6 @@ class LogseqConverter:
                 properties.append(f"  modified:: {modified_date}")
         
         # Add content type detection
-        content_type = self._detect_content_type(page_data)
         if content_type:
             properties.append(f"  type:: [[{content_type}]]")
         
@@ -548,26 +735,28 @@ class LogseqConverter:
     
     def _detect_content_type(self, page_data: Dict) -> Optional[str]:
         """Detect the type of content in the page."""
-        content_str = json.dumps(page_data.get('content', []))
-        
-        # Check for different content patterns
-        if re.search(r'(meeting|minutes|agenda)', content_str, re.IGNORECASE):
-            return 'meeting-notes'
-        elif re.search(r'(todo|task|action item)', content_str, re.IGNORECASE):
-            return 'task-list'
-        elif re.search(r'(research|analysis|study)', content_str, re.IGNORECASE):
-            return 'research'
-        elif re.search(r'(diary|journal|daily)', content_str, re.IGNORECASE):
-            return 'diary-entry'
-        elif re.search(r'(project|development|implementation)', content_str, re.IGNORECASE):
-            return 'project-notes'
-        
-        return None
+        # Check for different content patterns in one scan per text leaf
+        best = None
+        for chunk in _iter_text_leaves(page_data.get('content', [])):
+            for match in _CONTENT_TYPE_RE.finditer(chunk):
+                found = _CONTENT_TYPES[match.lastgroup]
+                if best is None or found < best:
+                    best = found
+                    if best[0] == 0:
+                        return best[1]
+        
+        return best[1] if best else None
     
     def _detect_special_content(self, text: str, item: Dict):
         """Detect special content like tasks, meetings, etc."""
+        found = set()
+        for match in _SPECIAL_CONTENT_RE.finditer(text):
+            found.add(match.lastgroup)
+            if len(found) == 2:
+                break
+
         # Detect TODO items
-        if re.search(r'\b(TODO|TASK|Action Item)\b', text, re.IGNORECASE):
+        if 'task' in found:
             priority = self._detect_priority(text)
             self.detected_tasks.append({
                 'text': text,
@@ -576,7 +765,7 @@ class LogseqConverter:
             })
         
         # Detect meetings
-        if re.search(r'\b(meeting|agenda|minutes)\b', text, re.IGNORECASE):
+        if 'meeting' in found:
             self.detected_meetings.append({
                 'text': text,
                 'object_id': item.get('object_id')
@@ -584,35 +773,34 @@ class LogseqConverter:
     
     def _detect_priority(self, text: str) -> str:
         """Detect priority level from text."""
-        if re.search(r'\b(urgent|critical|high priority|asap)\b', text, re.IGNORECASE):
+        if _PRIORITY_A_RE.search(text):
             return 'A'
-        elif re.search(r'\b(important|medium priority)\b', text, re.IGNORECASE):
+        elif _PRIORITY_B_RE.search(text):
             return 'B'
         else:
             return 'C'
     
     def _is_task_item(self, text: str) -> bool:
         """Check if text represents a task."""
-        task_patterns = [
-            r'^\s*\[[ xX]\]',  # Checkbox format
-            r'^\s*(TODO|DONE|TASK):?\s',  # TODO/DONE prefix
-            r'^\s*[-*]\s*(TODO|DONE|TASK):?\s',  # List with TODO
-        ]
+        # Every task pattern starts with one of these; skip the regexes otherwise
+        stripped = text.lstrip()
+        if not stripped or stripped[0] not in _TASK_START_CHARS:
+            return False
         
-        for pattern in task_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern in _TASK_PATTERNS:
+            if pattern.search(text):
                 return True
         return False
     
     def _parse_task_item(self, text: str) -> tuple:
         """Parse task item to extract state and text."""
         # Check for checkbox
-        if match := re.match(r'^\s*\[([ xX])\]\s*(.+)$', text):
+        if match := _CHECKBOX_RE.match(text):
             state = 'DONE' if match.group(1).lower() == 'x' else 'TODO'
             return state, match.group(2)
         
         # Check for TODO/DONE prefix
-        if match := re.match(r'^\s*(?:[-*]\s*)?(TODO|DONE|TASK):?\s*(.+)$', text, re.IGNORECASE):
+        if match := _TASK_PREFIX_RE.match(text):
             state = 'DONE' if match.group(1).upper() == 'DONE' else 'TODO'
             return state, match.group(2)
         
@@ -620,15 +808,14 @@ class LogseqConverter:
     
     def _extract_date_from_content(self, page_data: Dict) -> Optional[str]:
         """Extract date from page content, especially from highlighted dates."""
-        content_str = json.dumps(page_data.get('content', []))
-        
         # Look for highlighted dates (converted to ^^date^^)
-        highlighted_dates = re.findall(r'\^\^([^^\n]+)\^\^', content_str)
-        
-        for date_text in highlighted_dates:
-            parsed_date = self._try_parse_date(date_text)
-            if parsed_date:
-                return parsed_date
+        for chunk in _iter_text_leaves(page_data.get('content', [])):
+            if '^^' not in chunk:
+                continue
+            for date_text in _HL_RE.findall(chunk):
+                parsed_date = self._try_parse_date(date_text)
+                if parsed_date:
+                    return parsed_date
         
         # Also check page title
         title = page_data.get('title', '')
@@ -644,21 +831,11 @@ class LogseqConverter:
         text = str(text)
         
         # Common date patterns
-        patterns = [
-            (r'(\d{1,2})\s+(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{4})', 
-             lambda m: f"{m.group(3)}-{self._month_to_number(m.group(2))}-{m.group(1).zfill(2)}"),
-            (r'(\d{4})-(\d{1,2})-(\d{1,2})', 
-             lambda m: f"{m.group(1)}-{m.group(2).zfill(2)}-{m.group(3).zfill(2)}"),
-            (r'(\d{1,2})/(\d{1,2})/(\d{4})', 
-             lambda m: f"{m.group(3)}-{m.group(1).zfill(2)}-{m.group(2).zfill(2)}")
-        ]
-        
-        for pattern, formatter in patterns:
-            if match := re.search(pattern, text, re.IGNORECASE):
-                try:
-                    return formatter(match)
-                except:
-                    continue
+        for pattern, year_group, month_group, day_group in _DATE_FORMATS:
+            if match := pattern.search(text):
+                month = match.group(month_group)
+                month = month.zfill(2) if month.isdigit() else self._month_to_number(month)
+                return f"{match.group(year_group)}-{month}-{match.group(day_group).zfill(2)}"
         
         return None
     
@@ -693,12 +870,7 @@ class LogseqConverter:
     
     def _month_to_number(self, month_name: str) -> str:
         """Convert month name to number."""
-        months = {
-            'january': '01', 'february': '02', 'march': '03', 'april': '04',
-            'may': '05', 'june': '06', 'july': '07', 'august': '08',
-            'september': '09', 'october': '10', 'november': '11', 'december': '12'
-        }
-        return months.get(month_name.lower(), '01')
+        return _MONTHS.get(month_name.lower(), '01')
     
     def _generate_tags(self, section_name: str, content_type: Optional[str]) -> List[str]:
         """Generate tags based on section and content type."""
@@ -732,7 +904,7 @@ class LogseqConverter:
             "",
             "- ## Overview",
             f"  - This section contains **{len(pages)}** pages from OneNote",
-            f"  - Imported on [[{datetime.now().strftime('%b %d')}th, {datetime.now().year}]]",
+            f"  - Imported on [[{self._import_date}]]",
             "",
             "- ## All Pages",
             "  - {{query (and (page-property section [[" + section_name + "]]) (not (page-property type [[dashboard]]))}}"
@@ -765,15 +937,18 @@ class LogseqConverter:
                 "  - {{query (and (page-property section [[" + section_name + "]]) (between [[30 days ago]] [[today]]))}}",
             ])
         
-        with open(dashboard_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(content))
+        with open(dashboard_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFERING) as f:
+            # Stream lines to the file instead of joining them into one string first
+            print(*content, sep='\n', end='', file=f)
         
         print(f"  Created dashboard: {dashboard_path.name}")
     
-    def _generate_block_reference(self, object_id: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _generate_block_reference(object_id: str) -> str:
         """Generate a unique block reference ID."""
         # Use first 8 chars of object_id hash for brevity
-        block_id = hashlib.md5(object_id.encode()).hexdigest()[:8]
+        block_id = hashlib.blake2b(object_id.encode(), digest_size=4).hexdigest()
         return f"#^{block_id}"
     
     def _strip_html_tags(self, text: str) -> str:
@@ -781,18 +956,24 @@ class LogseqConverter:
         if not text:
             return ''
 
+        # Plain titles (the common case) only need whitespace cleanup
+        if '<' not in text and '&' not in text:
+            return ' '.join(text.split())
+
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _TAG_RE.sub('', text)
 
         # Decode HTML entities
         text = html.unescape(text)
 
         # Clean up excessive whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = ' '.join(text.split())
 
         return text
 
-    def _sanitize_page_name(self, name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _sanitize_page_name(name: str) -> str:
         """Sanitize page name for Logseq."""
         if not isinstance(name, str):
             name = str(name) if name is not None else 'untitled'
@@ -802,13 +983,10 @@ class LogseqConverter:
 
         # Logseq doesn't like certain characters
         # Keep spaces but remove other special chars
-        name = re.sub(r'[<>:"/\\|?*\[\]]', '', name)
+        name = name.translate(_INVALID_PAGE_CHARS)
         
-        # Remove multiple spaces
-        name = re.sub(r'\s+', ' ', name)
-        
-        # Trim
-        name = name.strip()
+        # Remove multiple spaces and trim
+        name = ' '.join(name.split())
         
         if not name:
             name = 'untitled'
@@ -816,7 +994,9 @@ class LogseqConverter:
         return name
 
 
-    def _shorten_name(self, name: str, max_length: int = 10) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _shorten_name(name: str, max_length: int = 10) -> str:
         """
         Intelligently shorten a name while preserving readability.
 
@@ -829,17 +1009,21 @@ class LogseqConverter:
         name = name.strip().lower()
 
         # Remove common words
-        common_words = {'the', 'a', 'an', 'of', 'for', 'with', 'and', 'or', 'in', 'on', 'at', 'to'}
         words = name.split()
-        words = [w for w in words if w not in common_words]
+        words = [w for w in words if w not in _COMMON_WORDS]
 
         if not words:
             words = name.split()  # Fallback to original
 
         # Join and clean
         shortened = '-'.join(words)
-        shortened = re.sub(r'[^a-z0-9-]', '', shortened)  # Keep only alphanumeric and hyphens
-        shortened = re.sub(r'-+', '-', shortened)  # Collapse multiple hyphens
+        # Keep only alphanumeric and hyphens
+        if shortened.isascii():
+            shortened = shortened.translate(_SLUG_DELETE)
+        else:
+            shortened = _NON_SLUG_RE.sub('', shortened)
+        if '--' in shortened:
+            shortened = _HYPHENS_RE.sub('-', shortened)  # Collapse multiple hyphens
 
         # Truncate if still too long
         if len(shortened) > max_length:
@@ -871,10 +1055,8 @@ class LogseqConverter:
         Example: ctrade-ideas-001.png
         Max length: ~30 characters (prevents Windows path limit issues)
 
-        If collision detected, adds 4-char hash suffix: ctrade-ideas-001-a3f9.png
+        If collision detected, adds a numeric suffix: ctrade-ideas-001-2.png
         """
-        import hashlib
-
         # Shorten section and page names
         section_short = self._shorten_name(section, max_length=8)
         page_short = self._shorten_name(page, max_length=8)
@@ -887,17 +1069,12 @@ class LogseqConverter:
         extension = self._get_image_extension(image_format)
         filename = f"{base_name}.{extension}"
 
-        # Check for collision
-        if filename in self.used_image_names:
-            # Generate a 4-character hash from the full names for uniqueness
-            hash_input = f"{section}-{page}-{count}".encode()
-            short_hash = hashlib.md5(hash_input).hexdigest()[:4]
-            filename = f"{base_name}-{short_hash}.{extension}"
-
-        # Track this filename
-        self.used_image_names.add(filename)
-
-        return filename
+        # Number repeats of the same filename instead of hashing the full names
+        uses = self._name_counters.get(filename, 0) + 1
+        self._name_counters[filename] = uses
+        if uses == 1:
+            return filename
+        return f"{base_name}-{uses}.{extension}"
     
     def _get_image_extension(self, image_format: str = None) -> str:
         """Get proper image file extension based on format."""
@@ -924,29 +1101,24 @@ class LogseqConverter:
         alt_text = item.get('alt_text') or item.get('alt', '')
         if alt_text:
             alt_lower = alt_text.lower()
-            if any(fmt in alt_lower for fmt in ['.jpg', '.jpeg', 'jpeg']):
-                return "jpeg"
-            elif '.png' in alt_lower or 'png' in alt_lower:
-                return "png"
-            elif '.gif' in alt_lower or 'gif' in alt_lower:
-                return "gif"
-            elif '.bmp' in alt_lower or 'bmp' in alt_lower:
-                return "bmp"
-            elif '.webp' in alt_lower or 'webp' in alt_lower:
-                return "webp"
+            for token, fmt in _FORMAT_HINTS:
+                if token in alt_lower:
+                    return fmt
         
         # Could also check filename patterns in callback_id if available
         callback_id = item.get('callback_id', '')
         if callback_id and isinstance(callback_id, str):
-            if 'jpg' in callback_id.lower() or 'jpeg' in callback_id.lower():
-                return "jpeg"
-            elif 'png' in callback_id.lower():
-                return "png"
+            callback_lower = callback_id.lower()
+            for token, fmt in _CALLBACK_FORMAT_HINTS:
+                if token in callback_lower:
+                    return fmt
         
         # No hint found - PowerShell will detect from binary data
         return None
     
-    def _reverse_sanitize_section_name(self, sanitized_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _reverse_sanitize_section_name(sanitized_name: str) -> str:
         r"""Attempt to reverse common sanitizations to get original section name.
         
         The PowerShell export script uses: $section.name -replace '[^\w\s-]', '_'
@@ -984,29 +1156,26 @@ class LogseqConverter:
         if not text:
             return True
         
-        content_without_tags = re.sub(r'<[^>]+>', '', text).strip()
-        return len(content_without_tags) == 0
+        # Matches only when every character belongs to a tag or is whitespace
+        return _TAGS_ONLY_RE.fullmatch(text) is not None
     
     def save_image_dictionary(self, output_path: Path = None):
         """Save image dictionary for PowerShell extraction."""
         if output_path is None:
             output_path = self.graph_root.parent / "logseq_image_extraction_map.json"
         
-        # Convert paths to strings for JSON
-        json_dict = {}
-        for callback_id, image_info in self.image_dictionary.items():
-            json_dict[callback_id] = {
-                'page_id': image_info['page_id'],
-                'target_path': str(image_info['target_path']),
-                'relative_path': image_info['relative_path'],
-                'alt_text': image_info['alt_text'],
-                'section': image_info['section'],  # Original section name for PowerShell lookup
-                'section_sanitized': image_info.get('section_sanitized', image_info['section']),  # Sanitized for reference
-                'page': image_info['page']
-            }
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(json_dict, f, indent=2, ensure_ascii=False)
+        # Expand image rows into the JSON objects the PowerShell script reads
+        json_dict = {
+            callback_id: dict(zip(_IMAGE_MAP_FIELDS, row))
+            for callback_id, row in self.image_dictionary.items()
+        }
+        
+        # Write to a temp file and swap it in, so anything watching for the
+        # map never reads it half-written
+        tmp_path = Path(f"{output_path}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            _dump_json(json_dict, f)
+        os.replace(tmp_path, output_path)
         
         print(f"Image extraction map saved: {output_path}")
         print(f"Found {len(self.image_dictionary)} images for extraction")
@@ -1028,7 +1197,7 @@ class LogseqConverter:
             "- # OneNote Import Dashboard",
             "- Properties:",
             "  type:: [[dashboard]]",
-            "  created:: [[" + datetime.now().strftime('%b %d') + "th, " + str(datetime.now().year) + "]]",
+            f"  created:: [[{self._import_date}]]",
             "",
             "- ## Import Summary",
             f"  - Total images found: **{len(self.image_dictionary)}**",
@@ -1059,7 +1228,7 @@ class LogseqConverter:
             "    - `{{query (page-property section [[Your Section Name]])}}`",
         ]
         
-        with open(dashboard_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(content))
+        with open(dashboard_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFERING) as f:
+            print(*content, sep='\n', end='', file=f)
         
         print(f"Created main dashboard: {dashboard_path.name}")
\ No newline at end of file
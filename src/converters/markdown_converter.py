@@ -9,9 +9,126 @@ from pathlib import Path
 import json
 import re
 import html
-from typing import Dict, List
+import sys
+from typing import Dict, List, Optional
+from functools import lru_cache
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import base64
 
+# orjson is optional; it only speeds up writing the JSON output files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Start of a highlight, hyperlink, source citation or any other tag; the
+# rest of each is located with str.find in _html_to_markdown_text
+_RE_HTML_START = re.compile(
+    r"(?P<hilite><span\s+style='background:yellow;mso-highlight:yellow'>)"
+    r'|(?P<link><a href=")'
+    r'|(?P<src>From &lt;)'
+    r'|(?P<tag><)')
+_RE_DAY_DATE = re.compile(r'(\w+day,\s+\d{1,2}\s+\w+\s+\d{4})')
+_RE_MULTI_NL = re.compile(r'\n{3,}')
+_RE_MULTI_SP = re.compile(r' {2,}')
+_FNAME_TRANS = str.maketrans({c: '-' for c in '<>:"/\\|?*'})
+_RE_NON_SLUG = re.compile(r'[^a-z0-9-]')
+_RE_HYPHENS = re.compile(r'-+')
+# Deletes the ASCII characters outside [a-z0-9-]; non-ASCII names use the regex
+_SLUG_DELETE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if c not in 'abcdefghijklmnopqrstuvwxyz0123456789-'))
+_COMMON_WORDS = frozenset({'the', 'a', 'an', 'of', 'for', 'with', 'and', 'or', 'in', 'on', 'at', 'to'})
+
+# Indentation strings for outline levels; deeper levels are built on demand
+_MAX_INDENT = 32
+_INDENTS = tuple("  " * level for level in range(_MAX_INDENT))
+
+# Pages and JSON files reach the OS in as few writes as possible
+_WRITE_BUFFERING = 256 * 1024
+
+
+def _dump_json(data, f):
+    """Write data to text file f as indented, non-ASCII-preserving JSON."""
+    if orjson is not None:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8'))
+    else:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _write_json(path: Path, data):
+    """Write data to a new JSON file at path."""
+    with open(path, 'w', encoding='utf-8', buffering=_WRITE_BUFFERING) as f:
+        _dump_json(data, f)
+
+
+def _find_from(text: str, needle: str, start: int, missing: Dict[str, int]) -> int:
+    """text.find(needle, start), remembering in missing where needle stops occurring."""
+    if start >= missing.get(needle, len(text) + 1):
+        return -1
+    index = text.find(needle, start)
+    if index < 0:
+        missing[needle] = min(start, missing.get(needle, start))
+    return index
+
+
+def _html_to_markdown_text(text: str) -> str:
+    """Convert highlights, hyperlinks and source citations and drop all other tags.
+
+    Each construct ends at the first closing marker after its start, so
+    plain str.find calls replace lazy regex scans; a marker missing from the
+    rest of the text is only searched for once, which keeps unclosed tags
+    linear. Captured text is converted too.
+    """
+    out = []
+    copied = pos = 0
+    missing = {}
+    while True:
+        match = _RE_HTML_START.search(text, pos)
+        if match is None:
+            break
+        kind = match.lastgroup
+        start, body = match.span()
+        replacement = None
+
+        if kind == 'hilite':
+            close = _find_from(text, '</span>', body, missing)
+            if close >= 0:
+                replacement = f"=={_html_to_markdown_text(text[body:close])}=="
+                end = close + len('</span>')
+        elif kind == 'link':
+            href_end = _find_from(text, '">', body, missing)
+            close = _find_from(text, '</a>', href_end + 2, missing) if href_end >= 0 else -1
+            if close >= 0:
+                link = _html_to_markdown_text(text[href_end + 2:close])
+                replacement = f"[{link}]({text[body:href_end]})"
+                end = close + len('</a>')
+        elif kind == 'src':
+            close = _find_from(text, '&gt;', body, missing)
+            if close >= 0 and text.find('\n', body, close) < 0:
+                replacement = f"*Source: {_html_to_markdown_text(text[body:close])}*"
+                end = close + len('&gt;')
+
+        # Anything starting with '<' that isn't converted is dropped as a tag
+        if replacement is None and kind != 'src':
+            close = _find_from(text, '>', start + 1, missing)
+            if close > start + 1:
+                replacement = ''
+                end = close + 1
+
+        if replacement is None:
+            pos = start + 1
+            continue
+        out.append(text[copied:start])
+        out.append(replacement)
+        copied = pos = end
+
+    if not out:
+        return text
+    out.append(text[copied:])
+    return ''.join(out)
+
+
 class MarkdownConverter:
     """Convert parsed OneNote content to markdown."""
 
@@ -19,8 +136,23 @@ class MarkdownConverter:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.image_dictionary = {}  # CallbackID -> target file path mapping
-        self.used_image_names = set()  # Track used names to avoid collisions
-        
+        self._name_counters = {}  # Filename -> times generated, for -2/-3 suffixes
+        self._io_pool = ThreadPoolExecutor(max_workers=4)  # Section metadata writes
+        self._pending_io = []  # Futures of writes not yet checked by close()
+        
+    def __getstate__(self):
+        # Page workers get a copy of the converter; the write pool stays here
+        state = self.__dict__.copy()
+        del state['_io_pool'], state['_pending_io']
+        return state
+    
+    def close(self):
+        """Wait for queued metadata writes and re-raise the first failure."""
+        self._io_pool.shutdown(wait=True)
+        pending, self._pending_io = self._pending_io, []
+        for future in pending:
+            future.result()
+    
     def convert_section(self, parsed_data: Dict) -> Path:
         """Convert a parsed section to markdown files."""
         section_name = parsed_data['section_name']
@@ -31,11 +163,18 @@ class MarkdownConverter:
         assets_dir = section_dir / 'assets'
         assets_dir.mkdir(exist_ok=True)
         
-        # Convert each page
-        page_files = []
-        for i, page in enumerate(parsed_data['pages'], 1):
-            page_file = self._convert_page(page, i, section_dir)
-            page_files.append(page_file)
+        # Convert each page; pages share no state, so larger sections are
+        # spread across worker processes (map keeps the page order)
+        pages = parsed_data['pages']
+        page_numbers = range(1, len(pages) + 1)
+        if len(pages) > 1:
+            with ProcessPoolExecutor() as executor:
+                page_files = list(executor.map(
+                    self._convert_page, pages, page_numbers, repeat(section_dir)
+                ))
+        else:
+            page_files = [self._convert_page(page, i, section_dir)
+                          for page, i in zip(pages, page_numbers)]
         
         # Save metadata
         metadata_file = section_dir / 'section-metadata.json'
@@ -47,8 +186,8 @@ class MarkdownConverter:
             'metadata': parsed_data['metadata']
         }
         
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        # Written in the background while the next section converts; see close()
+        self._pending_io.append(self._io_pool.submit(_write_json, metadata_file, metadata))
         
         print(f"Converted section '{section_name}' with {len(page_files)} pages")
         return section_dir
@@ -87,13 +226,11 @@ class MarkdownConverter:
         
         # Convert content hierarchy (now with proper image links)
         for item in parsed_data['content']:
-            md_content = self._convert_xml_content_item(item, image_mapping)
-            if md_content:
-                md_lines.append(md_content)
+            self._convert_xml_content_item(item, image_mapping, md_lines)
         
         # Write markdown file
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(md_lines))
+        with open(page_file, 'w', encoding='utf-8', buffering=_WRITE_BUFFERING) as f:
+            print(*md_lines, sep='\n', end='', file=f)
         
         return page_file
     
@@ -119,6 +256,9 @@ class MarkdownConverter:
             if item.get('type') == 'image' and isinstance(item.get('content'), dict):
                 all_images.append(item['content'])
         
+        # Resolve the assets folder once; the image files need no lookup of their own
+        assets_abs = assets_dir.resolve()
+        
         # Generate file paths and add to dictionary
         for i, img in enumerate(all_images):
             callback_id = img.get('callback_id')
@@ -129,10 +269,11 @@ class MarkdownConverter:
                 image_filename = self._generate_image_filename(
                     section_name, page_name, i + 1, extension='png'
                 )
-                image_path = assets_dir / image_filename
+                image_path = assets_abs / image_filename
 
-                # Store alt text for reference (not in filename)
-                alt_text = img.get('alt', f'image_{i+1}')
+                # Store alt text for reference (not in filename); the
+                # image_N defaults recur on every page, so share one copy
+                alt_text = sys.intern(img.get('alt', f'image_{i+1}'))
                 
                 # Store relative path from markdown file
                 relative_path = f"assets/{image_filename}"
@@ -141,7 +282,7 @@ class MarkdownConverter:
                 # Add to global dictionary for PowerShell script
                 self.image_dictionary[callback_id] = {
                     'page_id': page_id,
-                    'target_path': str(image_path.resolve()),
+                    'target_path': str(image_path),
                     'relative_path': relative_path,
                     'alt_text': alt_text,
                     'section': section_name,
@@ -154,84 +295,75 @@ class MarkdownConverter:
         """Save the image dictionary to JSON file for PowerShell script."""
         dict_file = self.output_dir / 'image_extraction_map.json'
         
-        with open(dict_file, 'w', encoding='utf-8') as f:
-            json.dump(self.image_dictionary, f, indent=2, ensure_ascii=False)
+        with open(dict_file, 'w', encoding='utf-8', buffering=_WRITE_BUFFERING) as f:
+            _dump_json(self.image_dictionary, f)
         
         return dict_file
     
-    def _convert_xml_content_item(self, item: Dict, image_mapping: Dict[str, str] = None) -> str:
-        """Convert XML content item to markdown."""
-        if image_mapping is None:
-            image_mapping = {}
+    def _convert_xml_content_item(self, item: Dict, image_mapping: Dict[str, str],
+                                  md_lines: List[str]) -> None:
+        """Convert XML content item and its children to markdown, appending lines to md_lines."""
+        # Depth-first walk on an explicit stack, so deep outlines cost no recursion
+        stack = [(item, 0)]
+        # Depths of open items whose line is empty; a subtree that produces
+        # nothing else adds no lines, so these are only written out once a
+        # descendant emits something
+        held = []
+        
+        while stack:
+            item, depth = stack.pop()
+            while held and held[-1] >= depth:
+                held.pop()
+            
+            line = self._convert_xml_item_line(item, image_mapping)
+            if line == '':
+                held.append(depth)
+            elif line is not None:
+                md_lines.extend([''] * len(held))
+                held.clear()
+                md_lines.append(line)
             
+            children = item.get('children')
+            if children:
+                stack.extend((child, depth + 1) for child in reversed(children))
+    
+    def _convert_xml_item_line(self, item: Dict, image_mapping: Dict[str, str]) -> Optional[str]:
+        """Markdown line for a single XML content item, without its children."""
         item_type = item.get('type', 'unknown')
         level = item.get('level', 0)
         content = item.get('content', '')
-        children = item.get('children', [])
-        
-        md_lines = []
         
         # Handle different content types
         if item_type == 'text' and content:
             # Convert CDATA HTML to markdown
             markdown_text = self._convert_html_to_markdown(content)
             # Add indentation for hierarchy
-            indent = "  " * level
-            md_lines.append(f"{indent}{markdown_text}")
+            indent = _INDENTS[level] if level < _MAX_INDENT else "  " * level
+            return f"{indent}{markdown_text}"
         
-        elif item_type == 'image':
+        if item_type == 'image' and isinstance(content, dict):
             # Handle image content with proper links
-            if isinstance(content, dict):
-                callback_id = content.get('callback_id', 'unknown')
-                alt_text = content.get('alt', 'Image')
-                indent = "  " * level
-                
-                # Use proper image path if available
-                if callback_id in image_mapping:
-                    image_path = image_mapping[callback_id]
-                    md_lines.append(f"{indent}![{alt_text}]({image_path})")
-                else:
-                    # Fallback to CallbackID notation
-                    md_lines.append(f"{indent}![{alt_text}](CallbackID: {callback_id})")
-        
-        # Process children recursively
-        for child in children:
-            child_md = self._convert_xml_content_item(child, image_mapping)
-            if child_md:
-                md_lines.append(child_md)
-        
-        return '\n'.join(md_lines)
+            callback_id = content.get('callback_id', 'unknown')
+            alt_text = content.get('alt', 'Image')
+            indent = _INDENTS[level] if level < _MAX_INDENT else "  " * level
+            
+            # Use proper image path if available
+            if callback_id in image_mapping:
+                image_path = image_mapping[callback_id]
+                return f"{indent}![{alt_text}]({image_path})"
+            # Fallback to CallbackID notation
+            return f"{indent}![{alt_text}](CallbackID: {callback_id})"
+        
+        return None
     
     def _convert_html_to_markdown(self, html_text: str) -> str:
         """Convert HTML in CDATA to markdown."""
         if not html_text:
             return ""
         
-        # Handle highlighting (with newlines in attributes)
-        html_text = re.sub(
-            r"<span\s+style='background:yellow;mso-highlight:yellow'>(.*?)</span>",
-            r"==\1==",
-            html_text,
-            flags=re.DOTALL
-        )
-        
-        # Handle hyperlinks
-        html_text = re.sub(
-            r'<a href="(.*?)">(.*?)</a>',
-            r'[\2](\1)',
-            html_text,
-            flags=re.DOTALL
-        )
-        
-        # Handle source citations
-        html_text = re.sub(
-            r'From &lt;(.*?)&gt;',
-            r'*Source: \1*',
-            html_text
-        )
-        
-        # Clean up remaining HTML tags (basic cleanup)
-        html_text = re.sub(r'<[^>]+>', '', html_text)
+        # Convert highlights, hyperlinks and source citations and drop all
+        # other tags in a single pass
+        html_text = _html_to_markdown_text(html_text)
         
         # Decode HTML entities (use proper decoder instead of manual replacement)
         html_text = html.unescape(html_text)
@@ -267,8 +399,8 @@ class MarkdownConverter:
                 md_lines.append(f"- Image {i}: `{img_src}`")
         
         # Write markdown file
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(md_lines))
+        with open(page_file, 'w', encoding='utf-8', buffering=_WRITE_BUFFERING) as f:
+            print(*md_lines, sep='\n', end='', file=f)
         
         return page_file
     
@@ -330,7 +462,7 @@ class MarkdownConverter:
             text = item.get('text', '').strip()
             if text and len(text) < 100 and not text.startswith('http'):
                 # Look for date patterns to use as title
-                date_match = re.search(r'(\w+day,\s+\d{1,2}\s+\w+\s+\d{4})', text)
+                date_match = _RE_DAY_DATE.search(text)
                 if date_match:
                     return date_match.group(1)
                 # Otherwise use first substantial text
@@ -342,8 +474,8 @@ class MarkdownConverter:
     def _clean_text(self, text: str) -> str:
         """Clean up text content."""
         # Remove excessive whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' {2,}', ' ', text)
+        text = _RE_MULTI_NL.sub('\n\n', text)
+        text = _RE_MULTI_SP.sub(' ', text)
         
         # Fix common encoding issues
         text = text.replace('\xa0', ' ')  # Non-breaking space
@@ -365,14 +497,16 @@ class MarkdownConverter:
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize string for use as filename."""
         # Remove invalid characters
-        name = re.sub(r'[<>:"/\\|?*]', '-', name)
+        name = name.translate(_FNAME_TRANS)
         # Limit length
         name = name[:50]
         # Remove trailing dots/spaces
         name = name.strip('. ')
         return name or 'untitled'
 
-    def _shorten_name(self, name: str, max_length: int = 10) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _shorten_name(name: str, max_length: int = 10) -> str:
         """
         Intelligently shorten a name while preserving readability.
 
@@ -386,17 +520,21 @@ class MarkdownConverter:
         name = name.strip().lower()
 
         # Remove common words
-        common_words = {'the', 'a', 'an', 'of', 'for', 'with', 'and', 'or', 'in', 'on', 'at', 'to'}
         words = name.split()
-        words = [w for w in words if w not in common_words]
+        words = [w for w in words if w not in _COMMON_WORDS]
 
         if not words:
             words = name.split()  # Fallback to original
 
         # Join and clean
         shortened = '-'.join(words)
-        shortened = re.sub(r'[^a-z0-9-]', '', shortened)  # Keep only alphanumeric and hyphens
-        shortened = re.sub(r'-+', '-', shortened)  # Collapse multiple hyphens
+        # Keep only alphanumeric and hyphens
+        if shortened.isascii():
+            shortened = shortened.translate(_SLUG_DELETE)
+        else:
+            shortened = _RE_NON_SLUG.sub('', shortened)
+        if '--' in shortened:
+            shortened = _RE_HYPHENS.sub('-', shortened)  # Collapse multiple hyphens
 
         # Truncate if still too long
         if len(shortened) > max_length:
@@ -429,10 +567,8 @@ class MarkdownConverter:
         Example: ctrade-ideas-001.png
         Max length: ~30 characters
 
-        If collision detected, adds 4-char random suffix: ctrade-ideas-001-a3f9.png
+        If collision detected, adds a numeric suffix: ctrade-ideas-001-2.png
         """
-        import hashlib
-
         # Shorten section and page names
         section_short = self._shorten_name(section_name, max_length=8)
         page_short = self._shorten_name(page_name, max_length=8)
@@ -442,17 +578,12 @@ class MarkdownConverter:
         base_name = f"{section_short}-{page_short}-{counter}"
         filename = f"{base_name}.{extension}"
 
-        # Check for collision
-        if filename in self.used_image_names:
-            # Generate a 4-character hash from the full names for uniqueness
-            hash_input = f"{section_name}-{page_name}-{image_index}".encode()
-            short_hash = hashlib.md5(hash_input).hexdigest()[:4]
-            filename = f"{base_name}-{short_hash}.{extension}"
-
-        # Track this filename
-        self.used_image_names.add(filename)
-
-        return filename
+        # Number repeats of the same filename instead of hashing the full names
+        uses = self._name_counters.get(filename, 0) + 1
+        self._name_counters[filename] = uses
+        if uses == 1:
+            return filename
+        return f"{base_name}-{uses}.{extension}"
 
 
 def main():
@@ -463,19 +594,22 @@ def main():
     exports_dir = Path(__file__).parent.parent.parent / 'exports'
     parsed_files = list(exports_dir.glob('*_parsed.json'))
     
-    for parsed_file in parsed_files:
-        print(f"\nConverting: {parsed_file.name}")
-        
-        with open(parsed_file, 'r', encoding='utf-8') as f:
-            parsed_data = json.load(f)
-        
-        try:
-            output_dir = converter.convert_section(parsed_data)
-            print(f"Output saved to: {output_dir}")
-        except Exception as e:
-            print(f"Error converting {parsed_file}: {e}")
-            import traceback
-            traceback.print_exc()
+    try:
+        for parsed_file in parsed_files:
+            print(f"\nConverting: {parsed_file.name}")
+            
+            with open(parsed_file, 'r', encoding='utf-8') as f:
+                parsed_data = json.load(f)
+            
+            try:
+                output_dir = converter.convert_section(parsed_data)
+                print(f"Output saved to: {output_dir}")
+            except Exception as e:
+                print(f"Error converting {parsed_file}: {e}")
+                import traceback
+                traceback.print_exc()
+    finally:
+        converter.close()
 
 
 if __name__ == "__main__":
@@ -7,7 +7,278 @@ Shared utilities for markdown conversion and sanitization.
 
 import re
 import html
-from typing import List, Tuple
+from html.entities import html5 as _HTML5_ENTITIES
+from bisect import bisect_right
+from functools import lru_cache, wraps
+from typing import Dict, List, Tuple
+
+# Code regions that escape_logseq_special_syntax leaves untouched: fenced
+# blocks (group 1) or inline code, found left to right in one scan
+_CODE_RE = re.compile(r'(```[\s\S]*?```)|`[^`\n]+?`')
+
+# Logseq syntax escaped outside code: {{ }}, :: (not in URLs), (( ))
+_LOGSEQ_SYNTAX_RE = re.compile(r'\{\{|\}\}|(?<!:)::(?!/)|\(\(|\)\)')
+_LOGSEQ_ESCAPES = {
+    '{{': '\\{\\{', '}}': '\\}\\}',
+    '::': '\\:\\:',
+    '((': '\\(\\(', '))': '\\)\\)',
+}
+_PROPERTY_COLONS_RE = re.compile(r'(?<!:)::(?!/)')
+
+# Brackets around content that may hold markdown links, and a single link
+_BRACKET_LINKS_RE = re.compile(r'\[((?:[^\[\]]|\[[^\]]+\]\([^\)]+\))+)\]')
+_MD_LINK_RE = re.compile(r'\[[^\]]+\]\([^\)]+\)')
+
+# Leftover tags and blank-line runs that html_to_markdown cleans up
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+
+# Opening tag of every formatting element html_to_markdown converts, plus
+# <br>; the group name identifies the element (see _TAG_NAMES)
+_OPEN_TAG_RE = re.compile(
+    r'<(?:'
+    r'(?P<strong>strong>)'
+    r'|(?P<b>b>)'
+    r"|(?P<bold_span>span\s+style=(?P<q_bold>['\"])font-weight:bold(?P=q_bold)[^>]*>)"
+    r'|(?P<em>em>)'
+    r'|(?P<i>i>)'
+    r"|(?P<italic_span>span\s+style=(?P<q_italic>['\"])font-style:italic(?P=q_italic)[^>]*>)"
+    r'|(?P<u>u>)'
+    r"|(?P<underline_span>span\s+style=(?P<q_underline>['\"])text-decoration:underline(?P=q_underline)[^>]*>)"
+    r'|(?P<s>s>)'
+    r'|(?P<strike>strike>)'
+    r'|(?P<del>del>)'
+    r"|(?P<strike_span>span\s+style=(?P<q_strike>['\"])text-decoration:line-through(?P=q_strike)[^>]*>)"
+    r'|(?P<code>code>)'
+    r'|(?P<tt>tt>)'
+    r'|(?P<sup>sup>)'
+    r'|(?P<sub>sub>)'
+    r"|(?P<highlight>span\s+style=(?P<q_highlight>['\"])background:yellow;mso-highlight:yellow(?P=q_highlight)[^>]*>)"
+    r'|(?P<link>a\s+href=["\'](?P<href>[^"\']+)["\'][^>]*>)'
+    r'|(?P<br>br\s*/?>)'
+    r')')
+
+# HTML tag name of each element; an element's content runs to the closing
+# tag that balances its opening tag, so <span> inside <span> nests properly
+_TAG_NAMES = {
+    'strong': 'strong', 'b': 'b', 'em': 'em', 'i': 'i', 'u': 'u',
+    's': 's', 'strike': 'strike', 'del': 'del',
+    'code': 'code', 'tt': 'tt', 'sup': 'sup', 'sub': 'sub',
+    'bold_span': 'span', 'italic_span': 'span', 'underline_span': 'span',
+    'strike_span': 'span', 'highlight': 'span',
+    'link': 'a',
+}
+
+# Any opening (group 'close' unset) or closing tag with the given name, for
+# pairing them up in _pair_tags
+_TAG_EVENT_RES = {
+    name: re.compile(rf'<(?:{name}[\s>]|(?P<close>/{name}>))')
+    for name in set(_TAG_NAMES.values())
+}
+
+# Markdown (prefix, suffix) for each element of _OPEN_TAG_RE except the
+# highlight, whose markers depend on the target app; link and br are
+# handled separately
+_TAG_MARKUP = {
+    'strong': ('**', '**'), 'b': ('**', '**'), 'bold_span': ('**', '**'),
+    'em': ('*', '*'), 'i': ('*', '*'), 'italic_span': ('*', '*'),
+    # Underline becomes bold (markdown doesn't have native underline)
+    'u': ('**', '**'), 'underline_span': ('**', '**'),
+    's': ('~~', '~~'), 'strike': ('~~', '~~'), 'del': ('~~', '~~'), 'strike_span': ('~~', '~~'),
+    'code': ('`', '`'), 'tt': ('`', '`'),
+    'sup': ('^[', ']'), 'sub': ('~[', ']'),
+}
+
+# Complete markup tables for the two highlight syntaxes in use
+# (== for Obsidian, ^^ for Logseq); see _markup_for
+_MARKUP_BY_HIGHLIGHT = {
+    syntax: {**_TAG_MARKUP, 'highlight': (syntax, syntax)} for syntax in ('==', '^^')
+}
+
+# Set to False to convert formatting tags with the earlier sequence of regex
+# passes (_convert_format_tags_by_passes) instead of the tag scanner. Call
+# html_to_markdown.cache_clear() after changing it at runtime.
+_USE_TAG_SCANNER = True
+
+# The passes, in their original order, as (pattern, element). Each element
+# ends at the first closing tag of its kind, so an element that wraps one
+# converted by a later pass and closing with the same tag is cut short
+_FORMAT_PASSES = [(re.compile(pattern, re.DOTALL), kind) for pattern, kind in (
+    (r'<strong>(.*?)</strong>', 'strong'),
+    (r'<b>(.*?)</b>', 'b'),
+    (r"<span\s+style='font-weight:bold'[^>]*>(.*?)</span>", 'bold_span'),
+    (r'<span\s+style="font-weight:bold"[^>]*>(.*?)</span>', 'bold_span'),
+    (r'<em>(.*?)</em>', 'em'),
+    (r'<i>(.*?)</i>', 'i'),
+    (r"<span\s+style='font-style:italic'[^>]*>(.*?)</span>", 'italic_span'),
+    (r'<span\s+style="font-style:italic"[^>]*>(.*?)</span>', 'italic_span'),
+    (r'<u>(.*?)</u>', 'u'),
+    (r"<span\s+style='text-decoration:underline'[^>]*>(.*?)</span>", 'underline_span'),
+    (r'<span\s+style="text-decoration:underline"[^>]*>(.*?)</span>', 'underline_span'),
+    (r'<s>(.*?)</s>', 's'),
+    (r'<strike>(.*?)</strike>', 'strike'),
+    (r'<del>(.*?)</del>', 'del'),
+    (r"<span\s+style='text-decoration:line-through'[^>]*>(.*?)</span>", 'strike_span'),
+    (r'<span\s+style="text-decoration:line-through"[^>]*>(.*?)</span>', 'strike_span'),
+    (r'<code>(.*?)</code>', 'code'),
+    (r'<tt>(.*?)</tt>', 'tt'),
+    (r'<sup>(.*?)</sup>', 'sup'),
+    (r'<sub>(.*?)</sub>', 'sub'),
+    (r"<span\s+style='background:yellow;mso-highlight:yellow'[^>]*>(.*?)</span>", 'highlight'),
+    (r'<span\s+style="background:yellow;mso-highlight:yellow"[^>]*>(.*?)</span>', 'highlight'),
+    (r'<a\s+href=["\']([^"\']+)["\'][^>]*>(.*?)</a>', 'link'),
+    (r'<br\s*/?>', 'br'),
+)]
+
+
+# Entities OneNote actually writes, decoded without html.unescape's full
+# HTML5 table; any other '&' sends the whole text to html.unescape
+_ENTITY_RE = re.compile(
+    r'&(?:(?P<named>amp|lt|gt|quot|apos|nbsp|hellip|mdash|ndash|rsquo|lsquo|rdquo|ldquo)'
+    r'|#(?P<dec>[0-9]+)|#[xX](?P<hex>[0-9a-fA-F]+));')
+_NAMED_ENTITIES = {name: _HTML5_ENTITIES[name + ';'] for name in (
+    'amp', 'lt', 'gt', 'quot', 'apos', 'nbsp', 'hellip',
+    'mdash', 'ndash', 'rsquo', 'lsquo', 'rdquo', 'ldquo')}
+
+
+def _decode_entity(match) -> str:
+    """Character for one _ENTITY_RE match."""
+    named = match.group('named')
+    if named:
+        return _NAMED_ENTITIES[named]
+    dec = match.group('dec')
+    codepoint = int(dec) if dec else int(match.group('hex'), 16)
+    # Control, surrogate and out-of-range references have special rules
+    if 0x20 <= codepoint < 0x7f or 0xa0 <= codepoint < 0xd800 or codepoint in (0x9, 0xa):
+        return chr(codepoint)
+    return html.unescape(match.group())
+
+
+def _unescape_entities(text: str) -> str:
+    """html.unescape, with a fast path for text holding only common entities."""
+    if '&' not in text:
+        return text
+    decoded, count = _ENTITY_RE.subn(_decode_entity, text)
+    if count == text.count('&'):
+        return decoded
+    return html.unescape(text)
+
+
+def _markup_for(highlight_syntax: str) -> Dict[str, Tuple[str, str]]:
+    """Markup table for _convert_format_tags with the given highlight syntax."""
+    markup = _MARKUP_BY_HIGHLIGHT.get(highlight_syntax)
+    if markup is None:
+        markup = {**_TAG_MARKUP, 'highlight': (highlight_syntax, highlight_syntax)}
+    return markup
+
+
+def _pair_tags(text: str, name: str) -> Dict[int, int]:
+    """Map the offset of each opening tag called name to its balancing closing tag.
+
+    Unbalanced opening tags are left out; stray closing tags are ignored.
+    """
+    pairs = {}
+    open_starts = []
+    for match in _TAG_EVENT_RES[name].finditer(text):
+        if match.group('close') is None:
+            open_starts.append(match.start())
+        elif open_starts:
+            pairs[open_starts.pop()] = match.start()
+    return pairs
+
+
+def _convert_format_tags(text: str, markup: Dict[str, Tuple[str, str]]) -> str:
+    """Replace formatting elements, links and <br> in text with markdown."""
+    return _convert_format_region(text, 0, len(text), markup, {})
+
+
+def _convert_format_tags_by_passes(text: str, markup: Dict[str, Tuple[str, str]]) -> str:
+    """Replace formatting elements, links and <br> with one regex pass per element.
+
+    Reference implementation for _convert_format_tags; see _USE_TAG_SCANNER.
+    """
+    for pattern, kind in _FORMAT_PASSES:
+        if kind == 'link':
+            text = pattern.sub(r'[\2](\1)', text)
+        elif kind == 'br':
+            text = pattern.sub('\n', text)
+        else:
+            prefix, suffix = markup[kind]
+            text = pattern.sub(lambda match: f"{prefix}{match.group(1)}{suffix}", text)
+    return text
+
+
+def _convert_format_region(text: str, lo: int, hi: int,
+                           markup: Dict[str, Tuple[str, str]],
+                           pairs: Dict[str, Dict[int, int]]) -> str:
+    """Markdown for text[lo:hi], see _convert_format_tags.
+
+    Works through the opening tags left to right. Each element's content
+    runs to the closing tag that balances its opening tag (from _pair_tags,
+    computed once per tag name for the whole text) and is converted
+    recursively; an opening tag that isn't closed within text[lo:hi] is
+    left as is.
+    """
+    out = []
+    copied = lo  # text[lo:copied] is already in out
+    search_from = lo
+
+    while True:
+        match = _OPEN_TAG_RE.search(text, search_from, hi)
+        if match is None:
+            break
+        kind = match.lastgroup
+        start, content_start = match.span()
+
+        if kind == 'br':
+            out.append(text[copied:start])
+            out.append('\n')
+            copied = search_from = content_start
+            continue
+
+        name = _TAG_NAMES[kind]
+        name_pairs = pairs.get(name)
+        if name_pairs is None:
+            name_pairs = pairs[name] = _pair_tags(text, name)
+        end = name_pairs.get(start, hi)
+        after = end + len(name) + 3  # past '</name>'
+        if after > hi:
+            search_from = start + 1
+            continue
+
+        inner = _convert_format_region(text, content_start, end, markup, pairs)
+        out.append(text[copied:start])
+        if kind == 'link':
+            out.append(f"[{inner}]({match.group('href')})")
+        else:
+            prefix, suffix = markup[kind]
+            out.append(f"{prefix}{inner}{suffix}")
+        copied = search_from = after
+
+    if not out:
+        return text[lo:hi]
+    out.append(text[copied:hi])
+    return ''.join(out)
+
+
+# Texts shorter than this are memoized by the public converters below;
+# OneNote repeats the same short paragraphs and template snippets a lot
+_MEMO_MAX_CHARS = 8192
+
+
+def _memoize_short(func):
+    """Cache func's results for texts under _MEMO_MAX_CHARS; longer ones bypass the cache."""
+    cached = lru_cache(maxsize=2048)(func)
+
+    @wraps(func)
+    def wrapper(text, *args, **kwargs):
+        if len(text) < _MEMO_MAX_CHARS:
+            return cached(text, *args, **kwargs)
+        return func(text, *args, **kwargs)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
 
 
 def _extract_code_blocks(text: str) -> List[Tuple[int, int, str]]:
@@ -16,29 +287,38 @@ def _extract_code_blocks(text: str) -> List[Tuple[int, int, str]]:
     Returns:
         List of (start, end, type) tuples where type is 'fence' or 'inline'
     """
-    code_regions = []
+    # Backticks of a fence can't also pair up as inline code, and matches
+    # come out in position order, so no sort is needed
+    return [(match.start(), match.end(), 'fence' if match.group(1) else 'inline')
+            for match in _CODE_RE.finditer(text)]
 
-    # Find fenced code blocks (```...```)
-    for match in re.finditer(r'```[\s\S]*?```', text):
-        code_regions.append((match.start(), match.end(), 'fence'))
 
-    # Find inline code (`...`)
-    for match in re.finditer(r'`[^`\n]+?`', text):
-        code_regions.append((match.start(), match.end(), 'inline'))
+def _index_code_regions(code_regions: List[Tuple[int, int, str]]) -> Tuple[List[int], List[int]]:
+    """Build the lookup lists for _is_in_code_context from sorted code regions.
 
-    # Sort by start position
-    code_regions.sort(key=lambda x: x[0])
-    return code_regions
+    Returns:
+        (starts, reach) where reach[i] is the furthest end of regions 0..i
+        (inline matches can sit inside a fence, so regions may overlap)
+    """
+    starts = []
+    reach = []
+    furthest = 0
+    for start, end, _ in code_regions:
+        furthest = max(furthest, end)
+        starts.append(start)
+        reach.append(furthest)
+    return starts, reach
 
 
-def _is_in_code_context(position: int, code_regions: List[Tuple[int, int, str]]) -> bool:
+def _is_in_code_context(position: int, starts: List[int], reach: List[int]) -> bool:
     """Check if a position is inside a code block or inline code."""
-    for start, end, _ in code_regions:
-        if start <= position < end:
-            return True
-    return False
+    # Regions starting at or before position are starts[:i + 1]; position is
+    # inside one of them exactly when it is short of their furthest end
+    i = bisect_right(starts, position) - 1
+    return i >= 0 and position < reach[i]
 
 
+@_memoize_short
 def escape_logseq_special_syntax(text: str) -> str:
     """Escape Logseq-specific syntax in non-code contexts.
 
@@ -68,36 +348,31 @@ def escape_logseq_special_syntax(text: str) -> str:
         >>> escape_logseq_special_syntax("head :: tail operator")
         'head \\\\:\\\\: tail operator'
     """
-    # Extract code regions to preserve them
-    code_regions = _extract_code_blocks(text)
+    # Without backticks or URLs every trigger is escaped, so plain
+    # replacements do it with no per-match Python callback
+    if '`' not in text and 'http' not in text:
+        for token in ('{{', '}}', '((', '))'):
+            if token in text:
+                text = text.replace(token, _LOGSEQ_ESCAPES[token])
+        return _PROPERTY_COLONS_RE.sub(r'\\:\\:', text)
 
-    # Process each pattern
-    result = text
-
-    # 1. Escape double curly braces {{...}}
-    # Find all {{ and }} outside code contexts
-    for match in reversed(list(re.finditer(r'\{\{|\}\}', result))):
-        if not _is_in_code_context(match.start(), code_regions):
-            # Escape by doubling the backslashes
-            escaped = '\\{\\{' if match.group() == '{{' else '\\}\\}'
-            result = result[:match.start()] + escaped + result[match.end():]
-
-    # 2. Escape double colons :: (but not in URLs or code)
-    # Pattern: :: not preceded by : and not followed by /
-    for match in reversed(list(re.finditer(r'(?<!:)::(?!/)', result))):
-        if not _is_in_code_context(match.start(), code_regions):
-            # Check if it's not part of a URL
-            before = result[max(0, match.start()-10):match.start()]
-            if 'http' not in before and 'https' not in before:
-                result = result[:match.start()] + '\\:\\:' + result[match.end():]
+    # Extract code regions to preserve them
+    starts, reach = _index_code_regions(_extract_code_blocks(text))
 
-    # 3. Escape double parentheses ((block-ref))
-    for match in reversed(list(re.finditer(r'\(\(|\)\)', result))):
-        if not _is_in_code_context(match.start(), code_regions):
-            escaped = '\\(\\(' if match.group() == '((' else '\\)\\)'
-            result = result[:match.start()] + escaped + result[match.end():]
+    # Every match is judged against the original text, so code regions and
+    # the URL check see unshifted positions
+    def escape_match(match):
+        """Escaped form of one Logseq trigger, or the trigger itself in code or URLs."""
+        token = match.group()
+        start = match.start()
+        if _is_in_code_context(start, starts, reach):
+            return token
+        # :: within a few characters of 'http' is taken to be part of a URL
+        if token == '::' and 'http' in text[max(0, start - 10):start]:
+            return token
+        return _LOGSEQ_ESCAPES[token]
 
-    return result
+    return _LOGSEQ_SYNTAX_RE.sub(escape_match, text)
 
 
 def escape_literal_brackets_with_links(text: str) -> str:
@@ -127,19 +402,18 @@ def escape_literal_brackets_with_links(text: str) -> str:
         >>> escape_literal_brackets_with_links("data = [[x](url1), [y](url2)]")
         'data = \\\\[[x](url1), [y](url2)\\\\]'
     """
-    # Pattern: Match brackets containing markdown links
+    # Pattern (_BRACKET_LINKS_RE): Match brackets containing markdown links
     # Uses lazy matching to handle nested content
     # (?:[^\[\]]|\[[^\]]+\]\([^\)]+\))+ matches either:
     #   - Non-bracket characters [^\[\]]
     #   - OR markdown links \[[^\]]+\]\([^\)]+\)
-    pattern = r'\[((?:[^\[\]]|\[[^\]]+\]\([^\)]+\))+)\]'
 
     def escape_outer_brackets(match):
         """Decide whether to escape the outer brackets."""
         inner = match.group(1)
 
         # Check if inner content has markdown links
-        has_links = bool(re.search(r'\[[^\]]+\]\([^\)]+\)', inner))
+        has_links = bool(_MD_LINK_RE.search(inner))
 
         # Only escape if there are multiple links or commas (indicates a list)
         # inner.count('[') > 2 means at least 2 markdown links (each has 2 brackets)
@@ -149,10 +423,11 @@ def escape_literal_brackets_with_links(text: str) -> str:
         return match.group(0)  # Don't modify single links
 
     # Apply once (recursive application can cause issues with already-escaped brackets)
-    text = re.sub(pattern, escape_outer_brackets, text)
+    text = _BRACKET_LINKS_RE.sub(escape_outer_brackets, text)
     return text
 
 
+@_memoize_short
 def html_to_markdown(html_text: str, highlight_syntax: str = '==') -> str:
     """Convert HTML to markdown with comprehensive tag and entity handling.
 
@@ -181,72 +456,27 @@ def html_to_markdown(html_text: str, highlight_syntax: str = '==') -> str:
     """
     text = html_text
 
+    # Plain text has no entities or tags to convert; skip straight to STEP 4
+    if '<' not in text and '&' not in text:
+        return _BLANK_LINES_RE.sub('\n\n', text).strip()
+
     # STEP 1: Decode HTML entities FIRST
     # This handles &nbsp;, &quot;, &lt;, &gt;, &amp;, &apos;, etc.
-    text = html.unescape(text)
-
-    # STEP 2: Convert formatting tags to markdown (order matters!)
-    # Use DOTALL flag to handle multi-line tags
-
-    # Bold - handle both tags and inline styles
-    text = re.sub(r'<strong>(.*?)</strong>', r'**\1**', text, flags=re.DOTALL)
-    text = re.sub(r'<b>(.*?)</b>', r'**\1**', text, flags=re.DOTALL)
-    text = re.sub(r"<span\s+style='font-weight:bold'[^>]*>(.*?)</span>", r'**\1**', text, flags=re.DOTALL)
-    text = re.sub(r'<span\s+style="font-weight:bold"[^>]*>(.*?)</span>', r'**\1**', text, flags=re.DOTALL)
-
-    # Italic - handle both tags and inline styles
-    text = re.sub(r'<em>(.*?)</em>', r'*\1*', text, flags=re.DOTALL)
-    text = re.sub(r'<i>(.*?)</i>', r'*\1*', text, flags=re.DOTALL)
-    text = re.sub(r"<span\s+style='font-style:italic'[^>]*>(.*?)</span>", r'*\1*', text, flags=re.DOTALL)
-    text = re.sub(r'<span\s+style="font-style:italic"[^>]*>(.*?)</span>', r'*\1*', text, flags=re.DOTALL)
-
-    # Underline - convert to bold (markdown doesn't have native underline)
-    text = re.sub(r'<u>(.*?)</u>', r'**\1**', text, flags=re.DOTALL)
-    text = re.sub(r"<span\s+style='text-decoration:underline'[^>]*>(.*?)</span>", r'**\1**', text, flags=re.DOTALL)
-    text = re.sub(r'<span\s+style="text-decoration:underline"[^>]*>(.*?)</span>', r'**\1**', text, flags=re.DOTALL)
-
-    # Strikethrough
-    text = re.sub(r'<s>(.*?)</s>', r'~~\1~~', text, flags=re.DOTALL)
-    text = re.sub(r'<strike>(.*?)</strike>', r'~~\1~~', text, flags=re.DOTALL)
-    text = re.sub(r'<del>(.*?)</del>', r'~~\1~~', text, flags=re.DOTALL)
-    text = re.sub(r"<span\s+style='text-decoration:line-through'[^>]*>(.*?)</span>", r'~~\1~~', text, flags=re.DOTALL)
-    text = re.sub(r'<span\s+style="text-decoration:line-through"[^>]*>(.*?)</span>', r'~~\1~~', text, flags=re.DOTALL)
-
-    # Code - inline code
-    text = re.sub(r'<code>(.*?)</code>', r'`\1`', text, flags=re.DOTALL)
-    text = re.sub(r'<tt>(.*?)</tt>', r'`\1`', text, flags=re.DOTALL)
-
-    # Superscript and Subscript (markdown extensions)
-    text = re.sub(r'<sup>(.*?)</sup>', r'^[\1]', text, flags=re.DOTALL)
-    text = re.sub(r'<sub>(.*?)</sub>', r'~[\1]', text, flags=re.DOTALL)
-
-    # Highlighting - OneNote yellow highlight
-    # Use the provided highlight syntax (== for Obsidian, ^^ for Logseq)
-    text = re.sub(
-        r"<span\s+style='background:yellow;mso-highlight:yellow'[^>]*>(.*?)</span>",
-        rf"{highlight_syntax}\1{highlight_syntax}",
-        text,
-        flags=re.DOTALL
-    )
-    text = re.sub(
-        r'<span\s+style="background:yellow;mso-highlight:yellow"[^>]*>(.*?)</span>',
-        rf"{highlight_syntax}\1{highlight_syntax}",
-        text,
-        flags=re.DOTALL
-    )
-
-    # Links
-    text = re.sub(r'<a\s+href=["\']([^"\']+)["\'][^>]*>(.*?)</a>', r'[\2](\1)', text, flags=re.DOTALL)
-
-    # Line breaks
-    text = re.sub(r'<br\s*/?>', '\n', text)
+    text = _unescape_entities(text)
+
+    # STEP 2: Convert formatting tags, links and line breaks to markdown
+    # Highlighting uses the provided syntax (== for Obsidian, ^^ for Logseq)
+    if _USE_TAG_SCANNER:
+        text = _convert_format_tags(text, _markup_for(highlight_syntax))
+    else:
+        text = _convert_format_tags_by_passes(text, _markup_for(highlight_syntax))
 
     # STEP 3: Strip remaining HTML tags (colors, fonts, language tags, etc.)
     # These don't have markdown equivalents, so we just keep the content
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _HTML_TAG_RE.sub('', text)
 
     # STEP 4: Clean up whitespace
-    text = re.sub(r'\n\s*\n', '\n\n', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
     text = text.strip()
 
     return text
@@ -6,15 +6,52 @@ Convert parsed OneNote content to Obsidian-compatible markdown vault
 """
 
 from pathlib import Path
+import os
 import json
 import re
 import html
+import sys
 from typing import Dict, List, Optional
 from datetime import datetime
+from functools import lru_cache
 import base64
 
 from .markdown_utils import escape_literal_brackets_with_links, html_to_markdown
 
+# orjson is optional; it only speeds up writing the JSON output files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_RE_HTML_TAG = re.compile(r'<[^>]+>')
+_RE_TAGS_ONLY = re.compile(r'(?:<[^>]+>|\s)*')
+_RE_FNAME_BAD = re.compile(r'[^\w\-_]')
+_RE_HYPHENS = re.compile(r'-+')
+_RE_NON_SLUG = re.compile(r'[^a-z0-9-]')
+# Deletes the ASCII characters outside [a-z0-9-]; non-ASCII names use the regex
+_SLUG_DELETE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if c not in 'abcdefghijklmnopqrstuvwxyz0123456789-'))
+_COMMON_WORDS = frozenset({'the', 'a', 'an', 'of', 'for', 'with', 'and', 'or', 'in', 'on', 'at', 'to'})
+_RE_DATE_LIKE = [re.compile(p, re.IGNORECASE) for p in (
+    r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
+    r'\d{1,2}/\d{1,2}/\d{4}',  # MM/DD/YYYY
+    r'(January|February|March|April|May|June|July|August|September|October|November|December)',
+    r'(diary|journal)\s*\d{4}'
+)]
+
+# Buffer size for section index files
+_WRITE_BUFFERING = 256 * 1024
+
+
+def _dump_json(data, f):
+    """Write data to text file f as indented, non-ASCII-preserving JSON."""
+    if orjson is not None:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8'))
+    else:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
 class ObsidianConverter:
     """Convert parsed OneNote content to Obsidian-compatible markdown vault."""
     
@@ -34,7 +71,8 @@ class ObsidianConverter:
             
         self.image_dictionary = {}  # CallbackID -> target file path mapping
         self.note_links = {}  # Track all notes for internal linking
-        self.used_image_names = set()  # Track used names to avoid collisions
+        self._name_counters = {}  # Filename -> times generated, for -2/-3 suffixes
+        self._import_date = datetime.now().strftime('%Y-%m-%d')  # Frontmatter date for every note
         
     def convert_section(self, parsed_data: Dict) -> Path:
         """Convert a parsed section to Obsidian vault structure."""
@@ -156,8 +194,9 @@ class ObsidianConverter:
             f"*Generated from OneNote section: {section_name}*"
         ])
         
-        with open(index_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(content))
+        with open(index_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFERING) as f:
+            # Write line by line rather than joining the whole index first
+            print(*content, sep='\n', end='', file=f)
             
     def _convert_page_to_folder(self, page_data: Dict, section_name: str, category: str, parent_folder: Path):
         """Convert a single OneNote page to Obsidian markdown in specified folder."""
@@ -287,6 +326,9 @@ class ObsidianConverter:
         if not callback_id:
             return [f"<!-- Missing image: {alt_text} -->"]
         
+        # The same few alt texts recur on many images; share one string each
+        alt_text = sys.intern(alt_text)
+        
         # Generate Obsidian-compatible image filename
         image_name = self._generate_image_name(section_name, page_title, alt_text, len(self.image_dictionary))
         
@@ -455,10 +497,8 @@ class ObsidianConverter:
         if not text:
             return True
         
-        # Remove HTML tags and check if there's actual content
-        import re
-        content_without_tags = re.sub(r'<[^>]+>', '', text).strip()
-        return len(content_without_tags) == 0
+        # Matches only when every character belongs to a tag or is whitespace
+        return _RE_TAGS_ONLY.fullmatch(text) is not None
     
     def _convert_outline_element(self, item: Dict, section_name: str, page_title: str) -> List[str]:
         """Convert outline element to Obsidian markdown."""
@@ -512,10 +552,10 @@ class ObsidianConverter:
         """Generate YAML frontmatter for Obsidian."""
         frontmatter_data = {
             'title': properties.get('title', 'Untitled'),
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': self._import_date,
             'tags': ['onenote-import'],
             'onenote_source': f"{properties.get('section', '')} > {properties.get('title', '')}",
-            'extraction_date': datetime.now().strftime('%Y-%m-%d')
+            'extraction_date': self._import_date
         }
         
         # Add optional properties
@@ -575,13 +615,13 @@ class ObsidianConverter:
             return ''
 
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _RE_HTML_TAG.sub('', text)
 
         # Decode HTML entities
         text = html.unescape(text)
 
         # Clean up excessive whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = ' '.join(text.split())
 
         return text
 
@@ -596,13 +636,13 @@ class ObsidianConverter:
             filename = 'untitled'
 
         # Replace spaces with hyphens
-        filename = re.sub(r'\s+', '-', filename)
+        filename = '-'.join(filename.split())
 
         # Remove special characters, keep alphanumeric, hyphens, underscores
-        filename = re.sub(r'[^\w\-_]', '', filename)
+        filename = _RE_FNAME_BAD.sub('', filename)
 
         # Remove multiple consecutive hyphens
-        filename = re.sub(r'-+', '-', filename)
+        filename = _RE_HYPHENS.sub('-', filename)
 
         # Trim hyphens from start/end (preserve underscores as they're often meaningful)
         filename = filename.strip('-')
@@ -613,7 +653,9 @@ class ObsidianConverter:
 
         return filename
     
-    def _shorten_name(self, name: str, max_length: int = 10) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _shorten_name(name: str, max_length: int = 10) -> str:
         """
         Intelligently shorten a name while preserving readability.
 
@@ -626,17 +668,21 @@ class ObsidianConverter:
         name = name.strip().lower()
 
         # Remove common words
-        common_words = {'the', 'a', 'an', 'of', 'for', 'with', 'and', 'or', 'in', 'on', 'at', 'to'}
         words = name.split()
-        words = [w for w in words if w not in common_words]
+        words = [w for w in words if w not in _COMMON_WORDS]
 
         if not words:
             words = name.split()  # Fallback to original
 
         # Join and clean
         shortened = '-'.join(words)
-        shortened = re.sub(r'[^a-z0-9-]', '', shortened)  # Keep only alphanumeric and hyphens
-        shortened = re.sub(r'-+', '-', shortened)  # Collapse multiple hyphens
+        # Keep only alphanumeric and hyphens
+        if shortened.isascii():
+            shortened = shortened.translate(_SLUG_DELETE)
+        else:
+            shortened = _RE_NON_SLUG.sub('', shortened)
+        if '--' in shortened:
+            shortened = _RE_HYPHENS.sub('-', shortened)  # Collapse multiple hyphens
 
         # Truncate if still too long
         if len(shortened) > max_length:
@@ -668,10 +714,8 @@ class ObsidianConverter:
         Example: ctrade-ideas-001.png
         Max length: ~30 characters (prevents Windows path limit issues)
 
-        If collision detected, adds 4-char hash suffix: ctrade-ideas-001-a3f9.png
+        If collision detected, adds a numeric suffix: ctrade-ideas-001-2.png
         """
-        import hashlib
-
         # Shorten section and page names
         section_short = self._shorten_name(section, max_length=8)
         page_short = self._shorten_name(page, max_length=8)
@@ -681,17 +725,12 @@ class ObsidianConverter:
         base_name = f"{section_short}-{page_short}-{counter}"
         filename = f"{base_name}.png"
 
-        # Check for collision
-        if filename in self.used_image_names:
-            # Generate a 4-character hash from the full names for uniqueness
-            hash_input = f"{section}-{page}-{count}".encode()
-            short_hash = hashlib.md5(hash_input).hexdigest()[:4]
-            filename = f"{base_name}-{short_hash}.png"
-
-        # Track this filename
-        self.used_image_names.add(filename)
-
-        return filename
+        # Number repeats of the same filename instead of hashing the full names
+        uses = self._name_counters.get(filename, 0) + 1
+        self._name_counters[filename] = uses
+        if uses == 1:
+            return filename
+        return f"{base_name}-{uses}.png"
     
     def _create_internal_link(self, page_title: str, section_name: str) -> str:
         """Create Obsidian internal link."""
@@ -703,15 +742,8 @@ class ObsidianConverter:
     
     def _is_date_like(self, title: str) -> bool:
         """Check if title looks like a date."""
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{1,2}/\d{1,2}/\d{4}',  # MM/DD/YYYY
-            r'(January|February|March|April|May|June|July|August|September|October|November|December)',
-            r'(diary|journal)\s*\d{4}'
-        ]
-        
-        for pattern in date_patterns:
-            if re.search(pattern, title, re.IGNORECASE):
+        for pattern in _RE_DATE_LIKE:
+            if pattern.search(title):
                 return True
         return False
     
@@ -769,8 +801,12 @@ class ObsidianConverter:
                 'page': image_info['page']
             }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(json_dict, f, indent=2, ensure_ascii=False)
+        # Write to a temp file and swap it in, so anything watching for the
+        # map never reads it half-written
+        tmp_path = Path(f"{output_path}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            _dump_json(json_dict, f)
+        os.replace(tmp_path, output_path)
         
         print(f"Image extraction map saved: {output_path}")
         print(f"Found {len(self.image_dictionary)} images for extraction")
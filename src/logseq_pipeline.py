@@ -8,6 +8,7 @@ Uses PowerShell COM exported XML files as input
 """
 
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import sys
 
 # Add src to path
@@ -18,30 +19,49 @@ from pipeline_base import (
     parse_pipeline_args,
     group_pages_by_section,
     discover_xml_files,
+    watch_sections,
     log_pipeline_start,
     log_conversion_summary
 )
 from extractors.onenote_xml_parser import OneNoteXMLParser
 from converters.logseq_converter import LogseqConverter
 
-def process_section(section_name: str, xml_files: list, converter: LogseqConverter, logger, notebook_name: str) -> tuple:
-    """Process all pages in a section."""
+def parse_page(xml_file: Path, notebook_name: str) -> dict:
+    """Parse one page XML file; runs in a worker process when a pool is given."""
+    parser = OneNoteXMLParser()
+    parsed_data = parser.parse_page_xml(xml_file)
+    
+    # Add notebook name to parsed data
+    parsed_data['notebook_name'] = notebook_name
+    return parsed_data
+
+def process_section(section_name: str, xml_files: list, converter: LogseqConverter, logger,
+                    notebook_name: str, executor: ProcessPoolExecutor = None) -> tuple:
+    """Process all pages in a section.
+
+    Pages are parsed in parallel on executor when one is given; conversion
+    stays in page order so image names and block references are unchanged.
+    """
     logger.info(f"Processing section: {section_name}")
     
     # Parse all pages in the section
     pages_data = []
     success_count = 0
     
-    for xml_file in xml_files:
+    if executor is not None and len(xml_files) > 1:
+        futures = [executor.submit(parse_page, xml_file, notebook_name) for xml_file in xml_files]
+    else:
+        futures = [None] * len(xml_files)
+    
+    for xml_file, future in zip(xml_files, futures):
         try:
             logger.info(f"  Parsing: {xml_file.name}")
             
             # Parse XML
-            parser = OneNoteXMLParser()
-            parsed_data = parser.parse_page_xml(xml_file)
-            
-            # Add notebook name to parsed data
-            parsed_data['notebook_name'] = notebook_name
+            if future is not None:
+                parsed_data = future.result()
+            else:
+                parsed_data = parse_page(xml_file, notebook_name)
             
             logger.info(f"    - Page: {parsed_data['page_name']}")
             logger.info(f"    - Content items: {len(parsed_data['content'])}")
@@ -67,13 +87,32 @@ def process_section(section_name: str, xml_files: list, converter: LogseqConvert
         
     return success_count, len(xml_files)
 
-def main():
-    """Main Logseq graph generation process."""
-    # Parse command line arguments
-    notebook_name, output_base_dir = parse_pipeline_args('logseq_pipeline.py')
+def run(notebook_name: str, output_base_dir: Path, watch: bool = False, logger=None,
+        stop=None) -> int:
+    """Run the Logseq graph generation process.
+
+    Called by main() for command-line use and directly (in-process) by
+    onenotexml.py.
+
+    Args:
+        notebook_name: Name of the OneNote notebook
+        output_base_dir: Notebook output directory (contains XML/)
+        watch: If True, convert sections while the XML export is still
+            writing them (see watch_sections)
+        logger: Logger to use; a file + console logger is set up if None
+        stop: threading.Event that ends watch mode early, as if the export
+            had failed (see watch_sections)
 
+    Returns:
+        0 if every page converted, 1 otherwise
+
+    Raises:
+        SystemExit: If the XML input is missing or the export failed or
+            was stopped
+    """
     # Setup logging
-    logger = setup_logging(output_base_dir.parent, 'OneNoteLogseq')
+    if logger is None:
+        logger = setup_logging(output_base_dir.parent, 'OneNoteLogseq')
 
     # Log pipeline start
     log_pipeline_start(logger, "Logseq Graph Generator",
@@ -86,12 +125,18 @@ def main():
     # Create Logseq output directory
     logseq_output_dir.mkdir(exist_ok=True)
 
-    # Discover XML files (includes validation and error handling)
-    xml_files = discover_xml_files(xml_input_dir, logger)
-    
-    # Group files by section
-    sections = group_pages_by_section(xml_files)
-    logger.info(f"Found {len(sections)} section(s): {list(sections.keys())}")
+    if watch:
+        # Convert each section as soon as the XML export has finished it
+        sections = {}
+        section_items = watch_sections(xml_input_dir, logger, sections, stop=stop)
+    else:
+        # Discover XML files (includes validation and error handling)
+        xml_files = discover_xml_files(xml_input_dir, logger)
+
+        # Group files by section
+        sections = group_pages_by_section(xml_files)
+        logger.info(f"Found {len(sections)} section(s): {list(sections.keys())}")
+        section_items = sections.items()
     
     # Create Logseq converter
     graph_name = f"{notebook_name}-Logseq"
@@ -101,16 +146,14 @@ def main():
     total_success = 0
     total_files = 0
     
-    for section_name, section_files in sections.items():
-        success, total = process_section(section_name, section_files, converter, logger, notebook_name)
-        total_success += success
-        total_files += total
+    with ProcessPoolExecutor() as executor:
+        for section_name, section_files in section_items:
+            success, total = process_section(section_name, section_files, converter, logger,
+                                             notebook_name, executor)
+            total_success += success
+            total_files += total
     
-    # Create main dashboard
-    if total_success > 0:
-        converter.create_main_dashboard()
-    
-    # Save image dictionary for PowerShell extraction
+    # Save image dictionary first so image extraction can start right away
     if total_success > 0:
         # Always try to save image dictionary, even if empty
         dict_file = converter.save_image_dictionary(logseq_output_dir / "image_extraction_map.json")
@@ -121,6 +164,10 @@ def main():
         else:
             logger.info("No images found in processed pages")
     
+    # Create main dashboard
+    if total_success > 0:
+        converter.create_main_dashboard()
+    
     # Create Logseq configuration file
     create_logseq_config(converter.graph_root, logger)
     
@@ -250,5 +297,12 @@ def create_logseq_config(graph_root: Path, logger):
     with open(pages_metadata_path, 'w', encoding='utf-8') as f:
         f.write("{}")
 
+def main():
+    """Main Logseq graph generation process."""
+    # Parse command line arguments
+    notebook_name, output_base_dir, watch = parse_pipeline_args('logseq_pipeline.py')
+
+    return run(notebook_name, output_base_dir, watch)
+
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -18,6 +18,7 @@ from pipeline_base import (
     parse_pipeline_args,
     group_pages_by_section,
     discover_xml_files,
+    watch_sections,
     log_pipeline_start,
     log_conversion_summary
 )
@@ -64,13 +65,32 @@ def process_section(section_name: str, xml_files: list, converter: ObsidianConve
         
     return success_count, len(xml_files)
 
-def main():
-    """Main Obsidian vault generation process."""
-    # Parse command line arguments
-    notebook_name, output_base_dir = parse_pipeline_args('obsidian_pipeline.py')
+def run(notebook_name: str, output_base_dir: Path, watch: bool = False, logger=None,
+        stop=None) -> int:
+    """Run the Obsidian vault generation process.
+
+    Called by main() for command-line use and directly (in-process) by
+    onenotexml.py.
 
+    Args:
+        notebook_name: Name of the OneNote notebook
+        output_base_dir: Notebook output directory (contains XML/)
+        watch: If True, convert sections while the XML export is still
+            writing them (see watch_sections)
+        logger: Logger to use; a file + console logger is set up if None
+        stop: threading.Event that ends watch mode early, as if the export
+            had failed (see watch_sections)
+
+    Returns:
+        0 if every page converted, 1 otherwise
+
+    Raises:
+        SystemExit: If the XML input is missing or the export failed or
+            was stopped
+    """
     # Setup logging
-    logger = setup_logging(output_base_dir.parent, 'OneNoteObsidian')
+    if logger is None:
+        logger = setup_logging(output_base_dir.parent, 'OneNoteObsidian')
 
     # Log pipeline start
     log_pipeline_start(logger, "Notebook-Specific Obsidian Vault Generator",
@@ -83,12 +103,18 @@ def main():
     # Create Obsidian output directory
     obsidian_output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Discover XML files (includes validation and error handling)
-    xml_files = discover_xml_files(xml_input_dir, logger)
-    
-    # Group files by section
-    sections = group_pages_by_section(xml_files)
-    logger.info(f"Found {len(sections)} section(s): {list(sections.keys())}")
+    if watch:
+        # Convert each section as soon as the XML export has finished it
+        sections = {}
+        section_items = watch_sections(xml_input_dir, logger, sections, stop=stop)
+    else:
+        # Discover XML files (includes validation and error handling)
+        xml_files = discover_xml_files(xml_input_dir, logger)
+
+        # Group files by section
+        sections = group_pages_by_section(xml_files)
+        logger.info(f"Found {len(sections)} section(s): {list(sections.keys())}")
+        section_items = sections.items()
     
     # Create Obsidian converter
     vault_name = f"{notebook_name}-Vault"
@@ -98,7 +124,7 @@ def main():
     total_success = 0
     total_files = 0
     
-    for section_name, section_files in sections.items():
+    for section_name, section_files in section_items:
         success, total = process_section(section_name, section_files, converter, logger)
         total_success += success
         total_files += total
@@ -227,5 +253,12 @@ This vault was generated from OneNote '{notebook_name}' notebook export. Here ar
     
     logger.info(f"Created Obsidian setup guide: {guide_path.name}")
 
+def main():
+    """Main Obsidian vault generation process."""
+    # Parse command line arguments
+    notebook_name, output_base_dir, watch = parse_pipeline_args('obsidian_pipeline.py')
+
+    return run(notebook_name, output_base_dir, watch)
+
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
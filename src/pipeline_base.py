@@ -7,11 +7,13 @@ Common functions used by both Obsidian and Logseq pipelines.
 """
 
 import sys
+import time
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 def setup_logging(output_dir: Path, logger_name: str) -> logging.Logger:
@@ -48,7 +50,7 @@ def setup_logging(output_dir: Path, logger_name: str) -> logging.Logger:
     return logging.getLogger(logger_name)
 
 
-def parse_pipeline_args(script_name: str) -> Tuple[str, Path]:
+def parse_pipeline_args(script_name: str) -> Tuple[str, Path, bool]:
     """
     Parse command line arguments for pipeline scripts.
 
@@ -56,20 +58,22 @@ def parse_pipeline_args(script_name: str) -> Tuple[str, Path]:
         script_name: Name of the script for usage message
 
     Returns:
-        Tuple of (notebook_name, output_base_dir)
+        Tuple of (notebook_name, output_base_dir, watch), where watch means
+        the XML export is still running (see watch_sections)
 
     Raises:
         SystemExit: If arguments are invalid
     """
     if len(sys.argv) < 3:
-        print(f"Usage: python {script_name} <notebook_name> <output_dir>")
+        print(f"Usage: python {script_name} <notebook_name> <output_dir> [--watch]")
         print(f"Example: python {script_name} 'Personal' 'output/Personal'")
         sys.exit(1)
 
     notebook_name = sys.argv[1]
     output_base_dir = Path(sys.argv[2])
+    watch = '--watch' in sys.argv[3:]
 
-    return notebook_name, output_base_dir
+    return notebook_name, output_base_dir, watch
 
 
 def group_pages_by_section(xml_files: List[Path]) -> Dict[str, List[Path]]:
@@ -161,6 +165,104 @@ def discover_xml_files(xml_input_dir: Path, logger: logging.Logger) -> List[Path
     return xml_files
 
 
+# Marker files written while the XML export runs: the export script drops
+# SECTION_DONE_MARKER in each section folder once all its pages are written,
+# and onenotexml.py drops EXPORT_DONE_MARKER / EXPORT_ABORTED_MARKER in the
+# notebook XML folder when the export exits
+SECTION_DONE_MARKER = '.done'
+EXPORT_DONE_MARKER = '.done'
+EXPORT_ABORTED_MARKER = '.abort'
+
+# Seconds watch_sections waits without new XML or an end-of-export marker
+# before it gives up on the export (onenotexml.py stops an export after 5
+# minutes in total)
+WATCH_IDLE_TIMEOUT = 600
+
+
+def watch_sections(xml_input_dir: Path, logger: logging.Logger, sections: Dict,
+                   poll_interval: float = 0.5, stop: Optional[threading.Event] = None,
+                   idle_timeout: float = WATCH_IDLE_TIMEOUT):
+    """
+    Yield sections as the XML export finishes writing them.
+
+    Lets conversion run alongside the export instead of after it. Sections
+    without a marker (e.g. XML from an older export) are picked up once the
+    whole export is done.
+
+    Args:
+        xml_input_dir: Directory the export writes section folders to
+        logger: Logger instance for reporting
+        sections: Dictionary that each yielded section is also recorded in
+            (section name -> XML files), for the summary
+        poll_interval: Seconds between directory scans
+        stop: Event that, once set, ends the watch like an aborted export
+            (for callers running the export in the same process)
+        idle_timeout: Seconds without new XML files after which the export
+            is taken to have died without writing an end marker
+
+    Yields:
+        Tuples of (section_name, xml_files), pages sorted as in
+        group_pages_by_section
+
+    Raises:
+        SystemExit: If the export failed, stopped writing XML for
+            idle_timeout seconds or produced no XML files
+    """
+    processed = set()
+    idle_deadline = time.monotonic() + idle_timeout
+
+    while True:
+        # Read the marker before scanning, so sections finished just before
+        # it was written are still picked up in this pass
+        export_done = (xml_input_dir / EXPORT_DONE_MARKER).exists()
+        if (xml_input_dir / EXPORT_ABORTED_MARKER).exists() or (stop is not None and stop.is_set()):
+            logger.error("XML export failed, stopping conversion")
+            print("\nThe XML export step failed.")
+            sys.exit(1)
+        if not export_done and time.monotonic() > idle_deadline:
+            logger.error(f"No XML written for {idle_timeout:g}s and the export never finished, "
+                         "stopping conversion")
+            print("\nThe XML export step stopped responding.")
+            sys.exit(1)
+
+        if xml_input_dir.exists():
+            for section_dir in xml_input_dir.iterdir():
+                if not section_dir.is_dir():
+                    continue
+                if not (export_done or (section_dir / SECTION_DONE_MARKER).exists()):
+                    continue
+
+                # Track files rather than folders: two OneNote sections can
+                # sanitize to the same folder name
+                xml_files = [f for f in section_dir.glob('*.xml') if f not in processed]
+                if not xml_files:
+                    continue
+                processed.update(xml_files)
+
+                for section_name, section_files in group_pages_by_section(xml_files).items():
+                    logger.info(f"Section ready: {section_name} ({len(section_files)} file(s))")
+                    sections.setdefault(section_name, []).extend(section_files)
+                    yield section_name, section_files
+
+                # Time spent converting the sections doesn't count as idle
+                idle_deadline = time.monotonic() + idle_timeout
+
+        if export_done:
+            break
+        if stop is not None:
+            stop.wait(poll_interval)
+        else:
+            time.sleep(poll_interval)
+
+    if not processed:
+        logger.warning(f"No XML files found in {xml_input_dir}")
+        print(f"\nNo XML files found in {xml_input_dir}")
+        print("The XML export step may have failed.")
+        sys.exit(1)
+
+    logger.info(f"Found {len(processed)} XML file(s) to process")
+
+
 def log_pipeline_start(logger: logging.Logger, pipeline_name: str,
                        notebook_name: str, output_dir: Path):
     """
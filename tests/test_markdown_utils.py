@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Denis Darkin
+# SPDX-License-Identifier: MIT
+"""
+Regression tests for the shared markdown utilities.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import random
+import unittest
+
+from src.converters import markdown_utils
+from src.converters.markdown_utils import escape_logseq_special_syntax, html_to_markdown
+
+HIGHLIGHT = "<span style='background:yellow;mso-highlight:yellow'>"
+BOLD_SPAN = "<span style='font-weight:bold'>"
+ITALIC_SPAN = "<span style='font-style:italic'>"
+
+
+class NestedFormattingTests(unittest.TestCase):
+    """Formatting elements nested in elements that share their closing tag."""
+
+    def test_bold_span_in_highlight(self):
+        html = f"{HIGHLIGHT}{BOLD_SPAN}Important</span> note</span>"
+        self.assertEqual(html_to_markdown(html, '^^'), '^^**Important** note^^')
+        self.assertEqual(html_to_markdown(html, '=='), '==**Important** note==')
+
+    def test_italic_span_in_highlight(self):
+        html = f"{HIGHLIGHT}{ITALIC_SPAN}x</span> y</span>"
+        self.assertEqual(html_to_markdown(html, '^^'), '^^*x* y^^')
+
+    def test_several_elements_in_highlight(self):
+        html = f"{HIGHLIGHT}<b>a</b> and {BOLD_SPAN}b</span></span>"
+        self.assertEqual(html_to_markdown(html, '^^'), '^^**a** and **b**^^')
+
+    def test_italic_in_bold(self):
+        self.assertEqual(html_to_markdown('<b><i>x</i> y</b>'), '***x* y**')
+        html = f"{BOLD_SPAN}{ITALIC_SPAN}x</span> y</span>"
+        self.assertEqual(html_to_markdown(html), '***x* y**')
+
+    def test_highlight_in_bold_span(self):
+        html = f"{BOLD_SPAN}{HIGHLIGHT}x</span> y</span>"
+        self.assertEqual(html_to_markdown(html, '^^'), '**^^x^^ y**')
+
+    def test_plain_span_in_highlight(self):
+        html = f"{HIGHLIGHT}<span lang=en-US>a</span> b</span>"
+        self.assertEqual(html_to_markdown(html, '^^'), '^^a b^^')
+
+    def test_bold_span_in_link(self):
+        html = f'<a href="http://u">{BOLD_SPAN}x</span> y</a>'
+        self.assertEqual(html_to_markdown(html), '[**x** y](http://u)')
+
+    def test_unclosed_highlight(self):
+        html = f"{HIGHLIGHT}unclosed {BOLD_SPAN}b</span>"
+        self.assertEqual(html_to_markdown(html, '^^'), 'unclosed **b**')
+
+
+# (opening tag, closing tag, markdown prefix, markdown suffix) for the
+# documents built by random_document
+ELEMENTS = [
+    ('<b>', '</b>', '**', '**'),
+    ('<strong>', '</strong>', '**', '**'),
+    (BOLD_SPAN, '</span>', '**', '**'),
+    ('<i>', '</i>', '*', '*'),
+    (ITALIC_SPAN, '</span>', '*', '*'),
+    ('<u>', '</u>', '**', '**'),
+    ('<s>', '</s>', '~~', '~~'),
+    ("<span style='text-decoration:line-through'>", '</span>', '~~', '~~'),
+    ('<code>', '</code>', '`', '`'),
+    ('<sup>', '</sup>', '^[', ']'),
+    (HIGHLIGHT, '</span>', '==', '=='),
+    ('<span lang=en-US>', '</span>', '', ''),
+    ('<a href="http://u">', '</a>', '[', '](http://u)'),
+]
+
+
+def random_document(rng, nest_same_closer, closers=(), depth=0):
+    """A well-formed nested HTML fragment and the markdown expected for it.
+
+    Unless nest_same_closer is set, no element is nested in another that
+    closes with the same tag, which keeps out the markup the multi-pass
+    converter pairs wrongly.
+    """
+    html = markdown = ''
+    for _ in range(rng.randint(1, 3)):
+        candidates = [element for element in ELEMENTS
+                      if nest_same_closer or element[1] not in closers]
+        if depth < 3 and rng.random() < 0.6:
+            opening, closing, prefix, suffix = rng.choice(candidates)
+            inner_html, inner_markdown = random_document(
+                rng, nest_same_closer, closers + (closing,), depth + 1)
+            html += f"{opening}{inner_html}{closing}"
+            markdown += f"{prefix}{inner_markdown}{suffix}"
+        else:
+            word = rng.choice(['x', 'y z', 'w'])
+            html += word
+            markdown += word
+    return html, markdown
+
+
+class TagScannerCrossCheckTests(unittest.TestCase):
+    """_convert_format_tags against the multi-pass reference converter."""
+
+    def setUp(self):
+        self.markup = markdown_utils._markup_for('==')
+
+    def scan(self, html):
+        return markdown_utils._convert_format_tags(html, self.markup)
+
+    def passes(self, html):
+        return markdown_utils._convert_format_tags_by_passes(html, self.markup)
+
+    def test_agrees_with_passes(self):
+        rng = random.Random(1)
+        for _ in range(2000):
+            html, expected = random_document(rng, nest_same_closer=False)
+            self.assertEqual(self.scan(html), self.passes(html), html)
+            self.assertEqual(markdown_utils._HTML_TAG_RE.sub('', self.scan(html)), expected, html)
+
+    def test_same_closing_tag_nesting(self):
+        rng = random.Random(2)
+        for _ in range(2000):
+            html, expected = random_document(rng, nest_same_closer=True)
+            self.assertEqual(markdown_utils._HTML_TAG_RE.sub('', self.scan(html)), expected, html)
+
+    def test_flag_selects_passes(self):
+        html = f"{BOLD_SPAN}{HIGHLIGHT}x</span> y</span>"
+        markdown_utils._USE_TAG_SCANNER = False
+        html_to_markdown.cache_clear()
+        try:
+            self.assertEqual(html_to_markdown(html), '**==x** y==')
+        finally:
+            markdown_utils._USE_TAG_SCANNER = True
+            html_to_markdown.cache_clear()
+        self.assertEqual(html_to_markdown(html), '**==x== y**')
+
+
+class LogseqEscapeTests(unittest.TestCase):
+    """escape_logseq_special_syntax outside and inside code."""
+
+    def test_docstring_examples(self):
+        self.assertEqual(escape_logseq_special_syntax('{{title}} is a query'),
+                         '\\{\\{title\\}\\} is a query')
+        self.assertEqual(escape_logseq_special_syntax('Use `{{var}}` in code'),
+                         'Use `{{var}}` in code')
+        self.assertEqual(escape_logseq_special_syntax('head :: tail operator'),
+                         'head \\:\\: tail operator')
+
+    def test_url_colons_kept(self):
+        self.assertEqual(escape_logseq_special_syntax('see http://x::y and a::b'),
+                         'see http://x::y and a\\:\\:b')
+
+    def test_code_after_escaped_braces(self):
+        # Escaping {{ }} earlier in the text doesn't shift later code out of place
+        self.assertEqual(escape_logseq_special_syntax('`{{a}}` {{b}} `::x`'),
+                         '`{{a}}` \\{\\{b\\}\\} `::x`')
+        self.assertEqual(escape_logseq_special_syntax('{{a}} `x ::` y'),
+                         '\\{\\{a\\}\\} `x ::` y')
+        self.assertEqual(escape_logseq_special_syntax('{{a}} `((b))` c'),
+                         '\\{\\{a\\}\\} `((b))` c')
+
+    def test_fenced_code(self):
+        self.assertEqual(escape_logseq_special_syntax('``` then {{q}} and ```'),
+                         '``` then {{q}} and ```')
+        self.assertEqual(escape_logseq_special_syntax('```\n{{q}}\n``` and {{r}}'),
+                         '```\n{{q}}\n``` and \\{\\{r\\}\\}')
+
+    def test_text_between_fences(self):
+        # The closing backtick of one fence and the opening backtick of the
+        # next don't make the text between them inline code
+        self.assertEqual(escape_logseq_special_syntax('```a``` then {{q}} and ```b```'),
+                         '```a``` then \\{\\{q\\}\\} and ```b```')
+        self.assertEqual(escape_logseq_special_syntax('```a``` `{{q}}` ```b```'),
+                         '```a``` `{{q}}` ```b```')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Denis Darkin
+# SPDX-License-Identifier: MIT
+"""
+Regression tests for the extraction helpers in onenotexml.py.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import onenotexml
+
+NOTEBOOK = 'Notes'
+# Notebook modification time well before any file written by the tests
+NOTEBOOK_MODIFIED = 1_000_000_000.0
+
+
+class XmlCacheTests(unittest.TestCase):
+    """xml_cache_is_fresh only reuses XML from a finished export."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.xml_dir = Path(self._tmp.name) / 'XML'
+        self.notebook_xml_dir = self.xml_dir / f'{NOTEBOOK}_XML'
+        section_dir = self.notebook_xml_dir / 'Section'
+        section_dir.mkdir(parents=True)
+        (section_dir / '001_Page.xml').write_text('<Page/>', encoding='utf-8')
+        self.logger = logging.getLogger('OneNoteXML.tests')
+
+        patcher = mock.patch.object(onenotexml, 'get_notebook_last_modified',
+                                    return_value=NOTEBOOK_MODIFIED)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def is_fresh(self):
+        return onenotexml.xml_cache_is_fresh(NOTEBOOK, self.xml_dir, self.logger)
+
+    def test_finished_export_is_reused(self):
+        (self.notebook_xml_dir / onenotexml.EXPORT_DONE_MARKER).touch()
+        self.assertTrue(self.is_fresh())
+
+    def test_export_without_done_marker_is_rejected(self):
+        self.assertFalse(self.is_fresh())
+
+    def test_aborted_export_is_rejected(self):
+        (self.notebook_xml_dir / onenotexml.EXPORT_ABORTED_MARKER).touch()
+        self.assertFalse(self.is_fresh())
+
+    def test_aborted_marker_wins_over_done_marker(self):
+        (self.notebook_xml_dir / onenotexml.EXPORT_DONE_MARKER).touch()
+        (self.notebook_xml_dir / onenotexml.EXPORT_ABORTED_MARKER).touch()
+        self.assertFalse(self.is_fresh())
+
+    def test_xml_older_than_notebook_is_rejected(self):
+        (self.notebook_xml_dir / onenotexml.EXPORT_DONE_MARKER).touch()
+        page = self.notebook_xml_dir / 'Section' / '001_Page.xml'
+        os.utime(page, (NOTEBOOK_MODIFIED - 60, NOTEBOOK_MODIFIED - 60))
+        self.assertFalse(self.is_fresh())
+
+
+HIERARCHY = (
+    '<one:Notebooks xmlns:one="http://schemas.microsoft.com/office/onenote/2013/onenote">'
+    '<one:Notebook name="Notes" path="C:\\Notes" lastModifiedTime="2025-01-15T10:23:45.000Z">'
+    '<one:Section name="S" lastModifiedTime="2025-02-01T08:00:00.000Z"/>'
+    '</one:Notebook></one:Notebooks>'
+)
+
+
+class NotebookLastModifiedTests(unittest.TestCase):
+    """get_notebook_last_modified reports why it can't read the time."""
+
+    def last_modified(self, hierarchy):
+        onenote = mock.Mock()
+        onenote.GetHierarchy.return_value = hierarchy
+        with mock.patch.object(onenotexml, '_get_onenote', return_value=onenote):
+            return onenotexml.get_notebook_last_modified(NOTEBOOK, logging.getLogger('OneNoteXML.tests'))
+
+    def test_newest_stamp(self):
+        self.assertEqual(self.last_modified(HIERARCHY), 1738396800.0)
+
+    def test_non_string_hierarchy_is_logged(self):
+        with self.assertLogs('OneNoteXML.tests', 'WARNING'):
+            self.assertIsNone(self.last_modified(None))
+
+    def test_malformed_hierarchy_is_logged(self):
+        with self.assertLogs('OneNoteXML.tests', 'WARNING'):
+            self.assertIsNone(self.last_modified('<one:Notebooks'))
+
+    def test_missing_pywin32_is_logged(self):
+        with mock.patch.object(onenotexml, '_get_onenote', side_effect=ImportError('no pywin32')):
+            with self.assertLogs('OneNoteXML.tests', 'WARNING'):
+                self.assertIsNone(onenotexml.get_notebook_last_modified(
+                    NOTEBOOK, logging.getLogger('OneNoteXML.tests')))
+
+
+if __name__ == '__main__':
+    unittest.main()